@@ -5,22 +5,26 @@
 # Created by Christian Bator on 01/02/2025
 #
 
-from typing import Tuple
+from typing import TYPE_CHECKING, Tuple, Callable, Optional
+from pathlib import Path
+from queue import Queue
+from threading import Thread
+import subprocess
 from string import capwords
-from math import floor, ceil, cos, sin
+from math import floor, ceil, cos, sin, isnan, nan
 
 from pure_pursuit.simulation.simulation_data import SimulationData
-from pure_pursuit.animation.matplotlib_extensions import draw_point, draw_points, draw_line, draw_circle, calculate_circle_points
+from pure_pursuit.animation.matplotlib_extensions import draw_point, draw_points, draw_line, draw_circle
 from pure_pursuit.utilities.geometry import bounding_box, Point
 from pure_pursuit.model.robot import Robot
 from pure_pursuit.controller.pure_pursuit_controller import PurePursuitController
 
-import matplotlib.pyplot as plot
-import matplotlib.ticker as ticker
-import matplotlib.patches as patches
-import matplotlib.transforms as transforms
-from matplotlib.animation import FuncAnimation
-from matplotlib.figure import Figure
+import numpy as np
+
+# Matplotlib is imported when animating, so importing the package without animating doesn't load it
+if TYPE_CHECKING:
+    from matplotlib.animation import FuncAnimation
+    from matplotlib.figure import Figure
 
 #
 # Animator
@@ -39,6 +43,9 @@ class Animator:
             follow: bool,
             print_frame_number: bool
     ):
+        import matplotlib.pyplot as plot
+        import matplotlib.ticker as ticker
+
         initial_state = simulation_data.states[0]
         max_look_ahead_diameter = 2.0 * controller.max_look_ahead_distance
         path_bounds = bounding_box(simulation_data.path.waypoints)
@@ -79,6 +86,33 @@ class Animator:
 
         axes.grid(which = "major", alpha = 0.3)
 
+        # Read the per-frame state fields as columns, so frames index arrays instead of walking attribute chains
+        states = simulation_data.states
+        num_states = len(states)
+
+        self._position_xs = states.position_xs
+        self._position_ys = states.position_ys
+        self._headings = states.headings
+        self._velocities = states.velocities
+        self._angular_velocities = states.angular_velocities
+        self._look_ahead_distances = states.look_ahead_distances
+        self._left_wheel_angular_velocities = states.left_wheel_angular_velocities
+        self._right_wheel_angular_velocities = states.right_wheel_angular_velocities
+        self._checkpoint_xs = simulation_data.path.xs[states.checkpoint_indices]
+        self._checkpoint_ys = simulation_data.path.ys[states.checkpoint_indices]
+        self._reference_point_xs = states.reference_point_xs
+        self._reference_point_ys = states.reference_point_ys
+        self._target_point_xs = states.target_point_xs
+        self._target_point_ys = states.target_point_ys
+
+        # Format the overlay text for every frame up front, with the angular velocity dead band applied once
+        dt = simulation_data.dt
+        angular_velocities = np.where(np.abs(self._angular_velocities) < 0.001, 0.0, self._angular_velocities)
+
+        self._time_strings = [f"t: {frame_index * dt:0,.1f} s" for frame_index in range(num_states)]
+        self._velocity_strings = [f"v: {velocity:0,.2f} m/s" for velocity in self._velocities.tolist()]
+        self._angular_velocity_strings = [f"\u03C9: {angular_velocity:0,.3f} rad/s" for angular_velocity in angular_velocities.tolist()]
+
         self._robot = robot
         self._simulation_data = simulation_data
         self._follow = follow
@@ -88,10 +122,116 @@ class Animator:
         self._axes = axes
         self._buffer = buffer
 
+    #
+    # Properties
+    #
+    @property
+    def figure(self) -> "Figure":
+        return self._figure
+
     #
     # Animation
     #
-    def animate(self) -> Tuple[Figure, FuncAnimation]:
+    def animate(self) -> Tuple["Figure", "FuncAnimation"]:
+        from matplotlib.animation import FuncAnimation
+
+        initialize_animation, animate_step = self._create_frame_functions()
+
+        animation = FuncAnimation(
+            self._figure,
+            animate_step, 
+            init_func = initialize_animation,
+            frames = len(self._position_xs),
+            interval = self._simulation_data.dt * 1000.0,
+            repeat = False,
+            # Only redraw the returned artists each frame. Following moves the axes limits,
+            # which invalidates the cached background, so it requires a full redraw.
+            blit = not(self._follow)
+        )
+
+        return (self._figure, animation)
+
+    def save(self, filepath: Path, frame_queue_size: int = 16) -> None:
+        """
+        Renders every frame and encodes them to `filepath` with ffmpeg.
+
+        Frames are drawn on the calling thread, since matplotlib isn't thread safe, and their raw pixels
+        are handed through a bounded queue to a writer thread that feeds ffmpeg's stdin. Drawing the next
+        frame then overlaps with ffmpeg encoding the previous ones, instead of waiting on every pipe write.
+        Each queued frame holds a full RGBA copy of the figure, so `frame_queue_size` bounds the memory used
+        when ffmpeg falls behind. Interactive animation keeps using `animate`, as GUI event loops have to
+        drive their own redraws.
+        """
+        from matplotlib import rcParams
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        initialize_animation, animate_step = self._create_frame_functions()
+
+        canvas = FigureCanvasAgg(self._figure)
+        initialize_animation()
+        canvas.draw()
+        width, height = canvas.get_width_height()
+
+        command = [
+            rcParams["animation.ffmpeg_path"],
+            "-y",
+            "-loglevel", "error",
+            "-f", "rawvideo",
+            "-vcodec", "rawvideo",
+            "-s", f"{width}x{height}",
+            "-pix_fmt", "rgba",
+            "-framerate", str(1.0 / self._simulation_data.dt),
+            "-i", "pipe:",
+            "-vcodec", "libx264",
+            "-pix_fmt", "yuv420p",
+            "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2",
+            str(filepath)
+        ]
+
+        process = subprocess.Popen(command, stdin = subprocess.PIPE, stderr = subprocess.PIPE)
+        frame_queue: Queue[Optional[bytes]] = Queue(maxsize = frame_queue_size)
+
+        def write_frames() -> None:
+            assert process.stdin is not None
+
+            try:
+                while (frame := frame_queue.get()) is not None:
+                    process.stdin.write(frame)
+            except OSError:
+                # ffmpeg exited early, keep draining so rendering doesn't block, its error is raised below
+                while frame_queue.get() is not None:
+                    pass
+            finally:
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+
+        writer = Thread(target = write_frames, name = "ffmpeg-writer", daemon = True)
+        writer.start()
+
+        try:
+            for frame_index in range(len(self._position_xs)):
+                animate_step(frame_index)
+                canvas.draw()
+                frame_queue.put(bytes(canvas.buffer_rgba()))
+        finally:
+            frame_queue.put(None)
+            writer.join()
+
+        assert process.stderr is not None
+        error_output = process.stderr.read()
+
+        if process.wait() != 0:
+            raise subprocess.CalledProcessError(process.returncode, command, stderr = error_output)
+
+    def _create_frame_functions(self) -> Tuple[Callable[[], tuple], Callable[[int], tuple]]:
+        """
+        Draws the animation artists and returns the functions that initialize them and update them for a frame
+        """
+        import matplotlib.patches as patches
+        import matplotlib.transforms as transforms
+
         path_line = draw_line(
             axes = self._axes,
             path = self._simulation_data.path.waypoints,
@@ -194,8 +334,9 @@ class Animator:
         wheel_line_max_length = 0.15
         wheel_line_line_width = 4.0
 
-        left_wheel_line = self._axes.vlines(
-            x = left_wheel_line_x,
+        # Both wheel bars share one collection, so a frame updates them with a single set_segments call
+        wheel_lines = self._axes.vlines(
+            x = [left_wheel_line_x, right_wheel_line_x],
             ymin = wheel_line_ymin,
             ymax = wheel_line_ymin,
             linewidth = wheel_line_line_width,
@@ -203,140 +344,149 @@ class Animator:
             transform = self._axes.transAxes
         )
 
-        right_wheel_line = self._axes.vlines(
-            x = right_wheel_line_x,
-            ymin = wheel_line_ymin,
-            ymax = wheel_line_ymin, 
-            linewidth = wheel_line_line_width,
-            color = "tab:green",
-            transform = self._axes.transAxes
-        )
-
-        num_animation_frames = len(self._simulation_data.states)
-
-        traveled_xdata = [state.pose.position.x for state in self._simulation_data.states]
-        traveled_ydata = [state.pose.position.y for state in self._simulation_data.states]
+        # Bind frame-invariant values as closure locals to avoid attribute chains in every frame
+        wheel_line_scale = self._robot.wheel_radius / self._robot.max_velocity * wheel_line_max_length
+        robot_frame_x_offset = 0.25 * self._robot.length
+        robot_frame_y_offset = 0.5 * self._robot.track_width
+
+        position_xs = self._position_xs
+        position_ys = self._position_ys
+        headings = self._headings
+        look_ahead_distances = self._look_ahead_distances
+        left_wheel_angular_velocities = self._left_wheel_angular_velocities
+        right_wheel_angular_velocities = self._right_wheel_angular_velocities
+        checkpoint_xs = self._checkpoint_xs
+        checkpoint_ys = self._checkpoint_ys
+        reference_point_xs = self._reference_point_xs
+        reference_point_ys = self._reference_point_ys
+        target_point_xs = self._target_point_xs
+        target_point_ys = self._target_point_ys
+        time_strings = self._time_strings
+        velocity_strings = self._velocity_strings
+        angular_velocity_strings = self._angular_velocity_strings
+
+        num_animation_frames = len(position_xs)
 
         handles, labels = self._axes.get_legend_handles_labels()
 
         legend_order = [1, 2, 0]
-        self._axes.legend([handles[index] for index in legend_order], [labels[index] for index in legend_order], loc = "lower right")
+        legend = self._axes.legend([handles[index] for index in legend_order], [labels[index] for index in legend_order], loc = "lower right")
 
         def initialize_animation() -> tuple:
             return (
+                robot_frame,
                 checkpoint_dot,
                 reference_point_dot,
+                traveled_path_line,
                 robot_center_dot,
                 robot_circle,
                 robot_heading_line,
-                robot_frame,
                 target_point_dot,
                 time_text,
                 velocity_text,
                 angular_velocity_text,
-                left_wheel_line,
-                right_wheel_line
+                wheel_lines,
+                legend
             )
 
+        # Last values written to the text and target point artists, setting an unchanged value still marks the artist stale
+        last_time_string = ""
+        last_velocity_string = ""
+        last_angular_velocity_string = ""
+        last_target_point = (nan, nan)
+
         def animate_step(frame_index: int) -> tuple:
+            nonlocal last_time_string, last_velocity_string, last_angular_velocity_string, last_target_point
+
             if self._print_frame_number:
                 print(f"  > Frame: {frame_index} / {num_animation_frames - 1}", end = "\n" if frame_index == (num_animation_frames - 1) else "\r")
 
-            state = self._simulation_data.states[frame_index]
-
-            time_text.set_text(f"t: {frame_index * self._simulation_data.dt:0,.1f} s")
-            velocity_text.set_text(f"v: {state.pose.velocity:0,.2f} m/s")
-
-            angular_velocity = 0.0 if -0.001 < state.pose.angular_velocity < 0.001 else state.pose.angular_velocity
-            angular_velocity_text.set_text(f"\u03C9: {angular_velocity:0,.3f} rad/s")
-
-            left_wheel_angular_velocity = state.command.left_wheel_angular_velocity
-            right_wheel_angular_velocity = state.command.right_wheel_angular_velocity
-
-            left_wheel_line.set_color("tab:red" if left_wheel_angular_velocity < 0.0 else "tab:green")
-            right_wheel_line.set_color("tab:red" if right_wheel_angular_velocity < 0.0 else "tab:green")
-
-            left_wheel_line.set_paths([[
-                (left_wheel_line_x, wheel_line_ymin),
-                (left_wheel_line_x, wheel_line_ymin + self._robot.wheel_radius * left_wheel_angular_velocity / self._robot.max_velocity * wheel_line_max_length)
-            ]])
-
-            right_wheel_line.set_paths([[
-                (right_wheel_line_x, wheel_line_ymin),
-                (right_wheel_line_x, wheel_line_ymin + self._robot.wheel_radius * right_wheel_angular_velocity / self._robot.max_velocity * wheel_line_max_length)
-            ]])
-
-            checkpoint_dot.set_xdata([self._simulation_data.path[state.checkpoint_index].x])
-            checkpoint_dot.set_ydata([self._simulation_data.path[state.checkpoint_index].y])
-
-            reference_point_dot.set_xdata([state.reference_point.x])
-            reference_point_dot.set_ydata([state.reference_point.y])
+            x = position_xs[frame_index]
+            y = position_ys[frame_index]
+            heading_cos = cos(headings[frame_index])
+            heading_sin = sin(headings[frame_index])
+            look_ahead_distance = look_ahead_distances[frame_index]
+            robot_heading_length = robot_heading_scalar * look_ahead_distance
+
+            time_string = time_strings[frame_index]
+            if time_string != last_time_string:
+                time_text.set_text(time_string)
+                last_time_string = time_string
+
+            velocity_string = velocity_strings[frame_index]
+            if velocity_string != last_velocity_string:
+                velocity_text.set_text(velocity_string)
+                last_velocity_string = velocity_string
+
+            angular_velocity_string = angular_velocity_strings[frame_index]
+            if angular_velocity_string != last_angular_velocity_string:
+                angular_velocity_text.set_text(angular_velocity_string)
+                last_angular_velocity_string = angular_velocity_string
+
+            left_wheel_angular_velocity = left_wheel_angular_velocities[frame_index]
+            right_wheel_angular_velocity = right_wheel_angular_velocities[frame_index]
+
+            wheel_lines.set_color([
+                "tab:red" if left_wheel_angular_velocity < 0.0 else "tab:green",
+                "tab:red" if right_wheel_angular_velocity < 0.0 else "tab:green"
+            ])
 
-            traveled_path_line.set_xdata(traveled_xdata[:frame_index])
-            traveled_path_line.set_ydata(traveled_ydata[:frame_index])
+            wheel_lines.set_segments([
+                [(left_wheel_line_x, wheel_line_ymin), (left_wheel_line_x, wheel_line_ymin + wheel_line_scale * left_wheel_angular_velocity)],
+                [(right_wheel_line_x, wheel_line_ymin), (right_wheel_line_x, wheel_line_ymin + wheel_line_scale * right_wheel_angular_velocity)]
+            ])
 
-            robot_center_dot.set_xdata([state.pose.position.x])
-            robot_center_dot.set_ydata([state.pose.position.y])
+            checkpoint_dot.set_data([checkpoint_xs[frame_index]], [checkpoint_ys[frame_index]])
 
-            robot_circle_point_xdata, robot_circle_point_ydata = calculate_circle_points(state.pose.position, state.look_ahead_distance)
-            robot_circle.set_xdata(robot_circle_point_xdata)
-            robot_circle.set_ydata(robot_circle_point_ydata)
+            reference_point_dot.set_data([reference_point_xs[frame_index]], [reference_point_ys[frame_index]])
 
-            robot_heading_line.set_xdata([
-                state.pose.position.x,
-                state.pose.position.x + robot_heading_scalar * state.look_ahead_distance * cos(state.pose.heading)
-            ])
+            traveled_path_line.set_data(position_xs[:frame_index], position_ys[:frame_index])
 
-            robot_heading_line.set_ydata([
-                state.pose.position.y, 
-                state.pose.position.y + robot_heading_scalar * state.look_ahead_distance * sin(state.pose.heading)
-            ])
+            robot_center_dot.set_data([x], [y])
 
-            robot_frame.set_transform(None)
+            robot_circle.set_center((x, y))
+            robot_circle.set_radius(look_ahead_distance)
 
-            robot_frame.set_xy((
-                state.pose.position.x - 0.25 * self._robot.length,
-                state.pose.position.y - 0.5 * self._robot.track_width)
+            robot_heading_line.set_data(
+                [x, x + robot_heading_length * heading_cos],
+                [y, y + robot_heading_length * heading_sin]
             )
 
-            robot_frame_rotation = transforms.Affine2D().rotate_around(
-                state.pose.position.x,
-                state.pose.position.y,
-                state.pose.heading
+            robot_frame.set_xy((
+                x - robot_frame_x_offset,
+                y - robot_frame_y_offset)
             )
 
-            robot_frame.set_transform(robot_frame_rotation + self._axes.transData)
+            # Update the persistent rotation in place, the composite transform with transData is invalidated and reused
+            robot_frame_rotation.set_matrix(np.array([
+                [heading_cos, -heading_sin, x - heading_cos * x + heading_sin * y],
+                [heading_sin, heading_cos, y - heading_sin * x - heading_cos * y],
+                [0.0, 0.0, 1.0]
+            ]))
 
-            if state.target_point is not None:
-                target_point_dot.set_xdata([state.target_point.x])
-                target_point_dot.set_ydata([state.target_point.y])
+            target_point = (target_point_xs[frame_index], target_point_ys[frame_index])
+            if not isnan(target_point[0]) and target_point != last_target_point:
+                target_point_dot.set_data([target_point[0]], [target_point[1]])
+                last_target_point = target_point
 
             if self._follow:
-                self._axes.set_xlim(state.pose.position.x - self._buffer, state.pose.position.x + self._buffer)
-                self._axes.set_ylim(state.pose.position.y - self._buffer, state.pose.position.y + self._buffer)
+                self._axes.set_xlim(x - self._buffer, x + self._buffer)
+                self._axes.set_ylim(y - self._buffer, y + self._buffer)
 
             return (
+                robot_frame,
                 checkpoint_dot,
                 reference_point_dot,
+                traveled_path_line,
                 robot_center_dot,
                 robot_circle,
                 robot_heading_line,
-                robot_frame,
                 target_point_dot,
                 time_text,
                 velocity_text,
                 angular_velocity_text,
-                left_wheel_line,
-                right_wheel_line
+                wheel_lines,
+                legend
             )
 
-        animation = FuncAnimation(
-            self._figure,
-            animate_step, 
-            init_func = initialize_animation,
-            frames = num_animation_frames,
-            interval = self._simulation_data.dt * 1000.0,
-            repeat = False
-        )
-
-        return (self._figure, animation)
+        return (initialize_animation, animate_step)
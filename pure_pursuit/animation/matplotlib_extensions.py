@@ -5,22 +5,39 @@
 # Created by Christian Bator on 01/02/2025
 #
 
-from typing import Sequence, Optional
-from math import radians, cos, sin
+from typing import TYPE_CHECKING, Sequence, Optional
 
-from pure_pursuit.utilities.math_extensions import inclusive_range
 from pure_pursuit.utilities.geometry import PointProtocol
 
-from matplotlib.pyplot import Axes
-from matplotlib.lines import Line2D
+import numpy as np
+
+# Matplotlib is imported when drawing, so importing the package for path adaptation or control doesn't load it
+if TYPE_CHECKING:
+	from matplotlib.axes import Axes
+	from matplotlib.lines import Line2D
+	from matplotlib.patches import Circle
+
+#
+# Coordinates
+#
+def coordinates(points: Sequence[PointProtocol]) -> tuple[np.ndarray, np.ndarray]:
+	"""
+	Returns the x and y coordinates of `points` as float arrays, so matplotlib doesn't have to convert python lists
+	"""
+	xs = np.fromiter((point.x for point in points), dtype = np.float64, count = len(points))
+	ys = np.fromiter((point.y for point in points), dtype = np.float64, count = len(points))
+
+	return (xs, ys)
 
 #
 # Draw Points
 #
-def draw_point(axes: Axes, point: Optional[PointProtocol], size: float = 4, color: Optional[str] = None, alpha: float = 1.0, label: Optional[str] = None) -> Line2D:
-	elements: list[Line2D] = axes.plot(
-		[point.x] if point is not None else [],
-		[point.y] if point is not None else [],
+def draw_point(axes: "Axes", point: Optional[PointProtocol], size: float = 4, color: Optional[str] = None, alpha: float = 1.0, label: Optional[str] = None) -> "Line2D":
+	xs, ys = coordinates([point] if point is not None else [])
+
+	elements: list["Line2D"] = axes.plot(
+		xs,
+		ys,
 		"o",
 		markersize = size,
 		color = color,
@@ -30,10 +47,12 @@ def draw_point(axes: Axes, point: Optional[PointProtocol], size: float = 4, colo
 
 	return elements[0]
 
-def draw_points(axes: Axes, points: Sequence[PointProtocol], size: float = 4.0, color: Optional[str] = None, alpha: float = 1.0, label: Optional[str] = None) -> Line2D:
-	elements: list[Line2D] = axes.plot(
-		[point.x for point in points],
-		[point.y for point in points],
+def draw_points(axes: "Axes", points: Sequence[PointProtocol], size: float = 4.0, color: Optional[str] = None, alpha: float = 1.0, label: Optional[str] = None) -> "Line2D":
+	xs, ys = coordinates(points)
+
+	elements: list["Line2D"] = axes.plot(
+		xs,
+		ys,
 		"o",
 		markersize = size,
 		color = color,
@@ -46,10 +65,12 @@ def draw_points(axes: Axes, points: Sequence[PointProtocol], size: float = 4.0,
 #
 # Draw Lines
 #
-def draw_line(axes: Axes, path: Sequence[PointProtocol], show_points: bool = False, line_style: str = "-", line_width: float = 1.5, line_color: Optional[str] = None, line_label: Optional[str] = None) -> Line2D:
-	elements: list[Line2D] = axes.plot(
-		[point.x for point in path], 
-		[point.y for point in path],
+def draw_line(axes: "Axes", path: Sequence[PointProtocol], show_points: bool = False, line_style: str = "-", line_width: float = 1.5, line_color: Optional[str] = None, line_label: Optional[str] = None) -> "Line2D":
+	xs, ys = coordinates(path)
+
+	elements: list["Line2D"] = axes.plot(
+		xs,
+		ys,
 		marker = "." if show_points else None,
 		linestyle = line_style,
 		linewidth = line_width,
@@ -62,22 +83,23 @@ def draw_line(axes: Axes, path: Sequence[PointProtocol], show_points: bool = Fal
 #
 # Draw Circles
 #
-def calculate_circle_points(center: PointProtocol, radius: float) -> tuple[list[float], list[float]]:
-	angles = []
-	for i in inclusive_range(0, 360, 10):
-		angle_in_radians = radians(float(i))
-		angles.append(angle_in_radians)
-	
-	xs = []
-	ys = []
-	for angle in angles:
-		xs.append(center.x + radius * cos(angle))
-		ys.append(center.y + radius * sin(angle))
+def draw_circle(axes: "Axes", center: PointProtocol, radius: float, line_width: float = 1.0, color: Optional[str] = None) -> "Circle":
+	"""
+	Draws an analytic circle patch, which can be moved with `set_center` and `set_radius` without resampling points
+	"""
+	from matplotlib.lines import Line2D
+	from matplotlib.patches import Circle
 
-	return (xs, ys)
+	circle = Circle(
+		(center.x, center.y),
+		radius,
+		fill = False,
+		linestyle = "-",
+		linewidth = line_width,
+		edgecolor = color,
+		zorder = Line2D.zorder
+	)
 
-def draw_circle(axes: Axes, center: PointProtocol, radius: float, line_width: float = 1.0, color: Optional[str] = None) -> Line2D:
-	circle_points = calculate_circle_points(center, radius)
-	elements: list[Line2D] = axes.plot(*circle_points, linestyle = "-", linewidth = line_width, color = color)
+	axes.add_patch(circle)
 
-	return elements[0]
+	return circle
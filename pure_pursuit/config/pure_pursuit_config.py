@@ -5,55 +5,36 @@
 # Created by Christian Bator on 01/02/2025
 #
 
-from typing import Self
+from typing import Any, Self
+from dataclasses import dataclass, fields, MISSING
 
 from pure_pursuit.utilities.json_codable import JSON, JSONDecodable
 
 #
 # PurePursuitConfig
 #
+@dataclass(frozen = True, slots = True)
 class PurePursuitConfig(JSONDecodable):
 
-    def __init__(
-        self,
-        min_look_ahead_distance: float,
-        max_look_ahead_distance: float,
-        angle_velocity_parameter: float,
-        final_approach_velocity: float,
-        end_condition_distance: float
-    ):
-        self._min_look_ahead_distance = min_look_ahead_distance
-        self._max_look_ahead_distance = max_look_ahead_distance
-        self._angle_velocity_parameter = angle_velocity_parameter
-        self._final_approach_velocity = final_approach_velocity
-        self._end_condition_distance = end_condition_distance
-
-    @property
-    def min_look_ahead_distance(self) -> float:
-        return self._min_look_ahead_distance
-    
-    @property
-    def max_look_ahead_distance(self) -> float:
-        return self._max_look_ahead_distance
-    
-    @property
-    def angle_velocity_parameter(self) -> float:
-        return self._angle_velocity_parameter
-    
-    @property
-    def final_approach_velocity(self) -> float:
-        return self._final_approach_velocity
-    
-    @property
-    def end_condition_distance(self) -> float:
-        return self._end_condition_distance
- 
+    min_look_ahead_distance: float
+    max_look_ahead_distance: float
+    angle_velocity_parameter: float
+    final_approach_velocity: float
+    end_condition_distance: float
+
+    # Number of segments past the current reference point's segment searched for the next reference point
+    max_reference_search_window: int = 5
+
+    # Tolerance in meters for dropping near-collinear path points before adaptation, disabled when zero
+    simplify_epsilon: float = 0.0
+
     @classmethod
     def decode(cls, json_data: JSON) -> Self:
-        return cls(
-            min_look_ahead_distance = float(json_data["min_look_ahead_distance"]),
-            max_look_ahead_distance = float(json_data["max_look_ahead_distance"]),
-            angle_velocity_parameter = float(json_data["angle_velocity_parameter"]),
-            final_approach_velocity = float(json_data["final_approach_velocity"]),
-            end_condition_distance = float(json_data["end_condition_distance"])
-        )
+        # Fields with defaults are optional in the JSON
+        values: dict[str, Any] = {
+            field.name: int(json_data[field.name]) if field.type is int else float(json_data[field.name])
+            for field in fields(cls)
+            if field.name in json_data or field.default is MISSING
+        }
+
+        return cls(**values)
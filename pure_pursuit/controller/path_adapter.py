@@ -5,10 +5,15 @@
 # Created by Christian Bator on 01/02/2025
 #
 
-from math import fabs, sqrt
+import struct
+import pathlib
+from typing import Optional, Self
 
-from pure_pursuit.utilities.math_extensions import is_float_equal, end_index, inclusive_range
-from pure_pursuit.utilities.geometry import Point, Waypoint, Path, distance_between, angle_between_segments
+from pure_pursuit.controller.path_adapter_kernels import ADAPTATION_VERSION, simplify_points, adapt_path_core
+from pure_pursuit.utilities.geometry import Point, Path
+from pure_pursuit.utilities.file_cache import digest, load_cached_arrays
+
+import numpy as np
 
 #
 # PathAdapter
@@ -19,58 +24,78 @@ class PathAdapter:
 	# Initialization
 	#
 	def __init__(self, raw_points: list[Point]):
-		self.raw_points = raw_points
-
-	#
-	# Path Adaptation
-	#
-	def adapt_path(self, max_velocity: float, max_acceleration: float, angle_velocity_parameter: float) -> Path:
-		angles: list[float] = []
-		distances: list[float] = []
-		distance_sum = 0.0
-		target_velocities: list[float] = []
-
-		for index, point in enumerate(self.raw_points):
-			if index == 0:
-				angle = 0.0
-				target_velocity = 0.0
-			elif index == end_index(self.raw_points):
-				angle = 0.0
-				distance_sum += distance_between(self.raw_points[index - 1], point)
-				target_velocity = 0.0
-			else:
-				angle = angle_between_segments(
-					[self.raw_points[index - 1], point],
-					[point, self.raw_points[index + 1]]
-				)
-
-				segment_length = distance_between(self.raw_points[index - 1], self.raw_points[index])
-				distance_sum += segment_length
-
-				parameter_constrained_target_velocity = min(max_velocity, angle_velocity_parameter / fabs(angle)) if not is_float_equal(angle, 0.0) else max_velocity
+		self._points = np.asarray([(point.x, point.y) for point in raw_points], dtype = np.float64).reshape(-1, 2)
 
-				acceleration_constrained_target_velocity = sqrt(target_velocities[index - 1]**2 + 2.0 * max_acceleration * segment_length)
+	@classmethod
+	def from_coordinates(cls, xs: np.ndarray, ys: np.ndarray) -> Self:
+		"""
+		Creates an adapter directly from coordinate arrays, without building a `Point` per raw point
+		"""
+		adapter = cls.__new__(cls)
+		adapter._points = np.column_stack((np.asarray(xs, dtype = np.float64), np.asarray(ys, dtype = np.float64)))
 
-				target_velocity = min(
-					parameter_constrained_target_velocity,
-					acceleration_constrained_target_velocity
-				)
+		return adapter
 
-			angles.append(angle)
-			distances.append(distance_sum)
-			target_velocities.append(target_velocity)
+	@property
+	def raw_points(self) -> list[Point]:
+		return [Point(x = x, y = y) for x, y in self._points.tolist()]
 
-		for index in inclusive_range(end_index(self.raw_points) - 1, 1, -1):
-			segment_length = distances[index + 1] - distances[index]
-			deceleration_constrained_target_velocity = sqrt(target_velocities[index + 1]**2 + 2.0 * max_acceleration * segment_length)
-
-			target_velocities[index] = min(target_velocities[index], deceleration_constrained_target_velocity)
-
-		waypoints: list[Waypoint] = [
-			Waypoint(position = item[0], angle = item[1], distance_along_path = item[2], target_velocity = item[3])
-			for item in zip(self.raw_points, angles, distances, target_velocities)
-		]
-
-		path = Path(waypoints = waypoints)
-
-		return path
+	#
+	# Path Adaptation
+	#
+	def adapt_path(
+		self,
+		max_velocity: float,
+		max_acceleration: float,
+		angle_velocity_parameter: float,
+		simplify_epsilon: float = 0.0,
+		cache_dir: Optional[pathlib.Path] = None
+	) -> Path:
+		"""
+		Returns the adapted path, cached in `cache_dir` (if given) by the raw points, parameters and `ADAPTATION_VERSION`,
+		so an unchanged path skips adaptation
+		"""
+		parameters = struct.pack("<4d", max_velocity, max_acceleration, angle_velocity_parameter, simplify_epsilon)
+		key = f"path-a{ADAPTATION_VERSION}-{digest(self._points.tobytes() + parameters)}"
+
+		columns = load_cached_arrays(
+			cache_dir = cache_dir,
+			key = key,
+			create = lambda: self._adapt_columns(
+				max_velocity = max_velocity,
+				max_acceleration = max_acceleration,
+				angle_velocity_parameter = angle_velocity_parameter,
+				simplify_epsilon = simplify_epsilon
+			)
+		)
+
+		return Path(
+			xs = columns["xs"],
+			ys = columns["ys"],
+			angles = columns["angles"],
+			distances_along_path = columns["distances_along_path"],
+			target_velocities = columns["target_velocities"]
+		)
+
+	def _adapt_columns(self, max_velocity: float, max_acceleration: float, angle_velocity_parameter: float, simplify_epsilon: float) -> dict[str, np.ndarray]:
+		points = self._points
+
+		# Drop near-collinear points before adaptation, so angles, distances, and target velocities describe the simplified path
+		if simplify_epsilon > 0.0:
+			points = points[simplify_points(points, simplify_epsilon)]
+
+		# Compute angles, cumulative distances, and target velocities in one compiled pass over the points
+		angles, distances, target_velocities = adapt_path_core(
+			points = points,
+			max_velocity = max_velocity,
+			max_acceleration = max_acceleration,
+			angle_velocity_parameter = angle_velocity_parameter
+		)
+
+		return {
+			"xs": points[:, 0],
+			"ys": points[:, 1],
+			"angles": angles,
+			"distances_along_path": distances,
+			"target_velocities": target_velocities
+		}
@@ -0,0 +1,169 @@
+#
+# path_adapter_kernels.py
+# pure-pursuit
+#
+# Created by Christian Bator on 10/14/2026
+#
+
+from math import fabs, sqrt, hypot, atan2
+
+from pure_pursuit.utilities.jit import njit
+
+import numpy as np
+
+# Bump whenever a change to these kernels, or to how `PathAdapter` calls them, changes adapted paths,
+# so paths cached by `PathAdapter.adapt_path` are adapted again instead of served stale
+ADAPTATION_VERSION = 1
+
+#
+# Velocity Sweeps
+#
+@njit(cache = True, fastmath = True)
+def forward_pass(
+	angles: np.ndarray,
+	segment_lengths: np.ndarray,
+	max_velocity: float,
+	max_acceleration: float,
+	angle_velocity_parameter: float
+) -> np.ndarray:
+	"""
+	Returns target velocities constrained by waypoint angles and acceleration from the previous waypoint.
+	The start and end waypoints have a target velocity of zero.
+	"""
+	target_velocities = np.zeros(len(angles))
+	two_max_acceleration = 2.0 * max_acceleration
+	previous_target_velocity = 0.0
+
+	for index in range(1, len(angles) - 1):
+		angle = fabs(angles[index])
+
+		if angle > 1e-9:
+			parameter_constrained_target_velocity = min(max_velocity, angle_velocity_parameter / angle)
+		else:
+			parameter_constrained_target_velocity = max_velocity
+
+		acceleration_constrained_target_velocity = sqrt(previous_target_velocity * previous_target_velocity + two_max_acceleration * segment_lengths[index - 1])
+
+		previous_target_velocity = min(parameter_constrained_target_velocity, acceleration_constrained_target_velocity)
+		target_velocities[index] = previous_target_velocity
+
+	return target_velocities
+
+@njit(cache = True, fastmath = True)
+def backward_pass(target_velocities: np.ndarray, segment_lengths: np.ndarray, max_acceleration: float) -> np.ndarray:
+	"""
+	Limits target velocities in place so the deceleration to the next waypoint doesn't exceed `max_acceleration`
+	"""
+	if len(target_velocities) < 3:
+		return target_velocities
+
+	two_max_acceleration = 2.0 * max_acceleration
+	next_target_velocity = target_velocities[-1]
+
+	for index in range(len(target_velocities) - 2, 0, -1):
+		deceleration_constrained_target_velocity = sqrt(next_target_velocity * next_target_velocity + two_max_acceleration * segment_lengths[index])
+
+		next_target_velocity = min(target_velocities[index], deceleration_constrained_target_velocity)
+		target_velocities[index] = next_target_velocity
+
+	return target_velocities
+
+#
+# Simplification
+#
+@njit(cache = True)
+def simplify_points(points: np.ndarray, epsilon: float) -> np.ndarray:
+	"""
+	Returns a mask of the points kept by Ramer-Douglas-Peucker simplification of an `(N, 2)` array of points.
+	Points within `epsilon` of the segment joining the kept points around them are dropped; the end points are always kept.
+	"""
+	num_points = len(points)
+	is_kept = np.ones(num_points, dtype = np.bool_)
+
+	if num_points < 3:
+		return is_kept
+
+	is_kept[1:-1] = False
+	squared_epsilon = epsilon * epsilon
+
+	# Ranges still to be simplified, processed with an explicit stack rather than recursion
+	ranges = np.empty((num_points, 2), dtype = np.int64)
+	ranges[0, 0] = 0
+	ranges[0, 1] = num_points - 1
+	range_count = 1
+
+	while range_count > 0:
+		range_count -= 1
+		start_index = ranges[range_count, 0]
+		end_index = ranges[range_count, 1]
+
+		ax = points[start_index, 0]
+		ay = points[start_index, 1]
+		segment_x = points[end_index, 0] - ax
+		segment_y = points[end_index, 1] - ay
+		segment_squared_length = segment_x * segment_x + segment_y * segment_y
+
+		max_squared_distance = 0.0
+		max_index = -1
+
+		for index in range(start_index + 1, end_index):
+			offset_x = points[index, 0] - ax
+			offset_y = points[index, 1] - ay
+
+			# Distance to the segment rather than its line, so points past a reversal in direction are kept
+			if segment_squared_length > 0.0:
+				proportion_of_segment = min(max((offset_x * segment_x + offset_y * segment_y) / segment_squared_length, 0.0), 1.0)
+				offset_x -= proportion_of_segment * segment_x
+				offset_y -= proportion_of_segment * segment_y
+
+			squared_distance = offset_x * offset_x + offset_y * offset_y
+
+			if squared_distance > max_squared_distance:
+				max_squared_distance = squared_distance
+				max_index = index
+
+		if max_index >= 0 and max_squared_distance > squared_epsilon:
+			is_kept[max_index] = True
+
+			ranges[range_count, 0] = start_index
+			ranges[range_count, 1] = max_index
+			ranges[range_count + 1, 0] = max_index
+			ranges[range_count + 1, 1] = end_index
+			range_count += 2
+
+	return is_kept
+
+#
+# Path Adaptation
+#
+@njit(cache = True)
+def adapt_path_core(
+	points: np.ndarray,
+	max_velocity: float,
+	max_acceleration: float,
+	angle_velocity_parameter: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+	"""
+	Returns the segment-to-segment angles, cumulative distances, and target velocities of an `(N, 2)` array of points
+	"""
+	num_points = len(points)
+	segment_lengths = np.empty(max(num_points - 1, 0))
+	distances = np.zeros(num_points)
+	angles = np.zeros(num_points)
+
+	for index in range(num_points - 1):
+		segment_lengths[index] = hypot(points[index + 1, 0] - points[index, 0], points[index + 1, 1] - points[index, 1])
+		distances[index + 1] = distances[index] + segment_lengths[index]
+
+	for index in range(1, num_points - 1):
+		incoming_x = points[index, 0] - points[index - 1, 0]
+		incoming_y = points[index, 1] - points[index - 1, 1]
+		outgoing_x = points[index + 1, 0] - points[index, 0]
+		outgoing_y = points[index + 1, 1] - points[index, 1]
+
+		angles[index] = atan2(incoming_x * outgoing_y - incoming_y * outgoing_x, incoming_x * outgoing_x + incoming_y * outgoing_y)
+
+	target_velocities = forward_pass(angles, segment_lengths, max_velocity, max_acceleration, angle_velocity_parameter)
+	backward_pass(target_velocities, segment_lengths, max_acceleration)
+
+	return (angles, distances, target_velocities)
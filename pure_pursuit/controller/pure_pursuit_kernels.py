@@ -0,0 +1,706 @@
+#
+# pure_pursuit_kernels.py
+# pure-pursuit
+#
+# Created by Christian Bator on 10/14/2026
+#
+
+from math import nan, fabs, sqrt, hypot, cos, sin
+
+from pure_pursuit.utilities.jit import njit
+
+import numpy as np
+
+#
+# Float Comparison
+#
+# Compiled copies of the math_extensions helpers, with the same tolerances as `math.isclose(..., abs_tol = 1e-9)`
+#
+@njit(cache = True)
+def is_float_equal(value: float, test_value: float) -> bool:
+	return fabs(value - test_value) <= max(1e-9 * max(fabs(value), fabs(test_value)), 1e-9)
+
+@njit(cache = True)
+def is_float_within(value: float, min_value: float, max_value: float) -> bool:
+	return (min_value < value < max_value) or is_float_equal(value, min_value) or is_float_equal(value, max_value)
+
+@njit(cache = True)
+def sgn(number: float) -> int:
+	# Zero (within 1e-9, as `is_float_equal(number, 0.0)`) counts as positive
+	return 1 if number >= -1e-9 else -1
+
+#
+# Target Point
+#
+@njit(cache = True, fastmath = True)
+def line_segment_circle_intersections(
+	xs: np.ndarray,
+	ys: np.ndarray,
+	segment_dxs: np.ndarray,
+	segment_dys: np.ndarray,
+	segment_squared_lengths: np.ndarray,
+	segment_index: int,
+	center_x: float,
+	center_y: float,
+	look_ahead_distance: float
+) -> tuple[int, float, float, float, float, float, float]:
+	"""
+	Returns the number of intersections between the segment and the circle defined by (center, look_ahead_distance),
+	followed by (x, y, proportion of segment) of up to two intersections in order
+	"""
+	x1 = xs[segment_index]
+	y1 = ys[segment_index]
+	x2 = xs[segment_index + 1]
+	y2 = ys[segment_index + 1]
+
+	# Translate points to place the center at the origin
+	offset_x1 = x1 - center_x
+	offset_y1 = y1 - center_y
+	offset_x2 = x2 - center_x
+	offset_y2 = y2 - center_y
+
+	# Calculate discriminant
+	dx = segment_dxs[segment_index]
+	dy = segment_dys[segment_index]
+	dr_squared = segment_squared_lengths[segment_index]
+	D = offset_x1 * offset_y2 - offset_x2 * offset_y1
+	discriminant = look_ahead_distance * look_ahead_distance * dr_squared - D * D
+
+	count = 0
+	intersection_x1 = nan
+	intersection_y1 = nan
+	intersection_proportion_1 = nan
+	intersection_x2 = nan
+	intersection_y2 = nan
+	intersection_proportion_2 = nan
+
+	# If discriminant is >= 0, at least one intersection exists
+	if discriminant >= 0.0:
+		root = sqrt(discriminant)
+		inverse_dr_squared = 1.0 / dr_squared
+
+		# Fold sgn(dy) into the root once, so the candidates share their terms (sgn treats values within 1e-9 of zero as positive)
+		signed_root = root if dy >= -1e-9 else -root
+		x_offset = dx * signed_root
+		y_offset = fabs(dy) * root
+
+		# Solve for intersections and offset them back to their original position
+		candidate_x1 = (D * dy + x_offset) * inverse_dr_squared + center_x
+		candidate_y1 = (-D * dx + y_offset) * inverse_dr_squared + center_y
+		candidate_x2 = (D * dy - x_offset) * inverse_dr_squared + center_x
+		candidate_y2 = (-D * dx - y_offset) * inverse_dr_squared + center_y
+
+		# Both intersections are the foot of the perpendicular from the center, offset along the segment by the half chord
+		foot_proportion = -(offset_x1 * dx + offset_y1 * dy) * inverse_dr_squared
+		half_chord_proportion = signed_root * inverse_dr_squared
+		candidate_proportion_1 = foot_proportion + half_chord_proportion
+		candidate_proportion_2 = foot_proportion - half_chord_proportion
+
+		# The candidates lie on the segment's line, so they're within the segment exactly when their proportion is in [0, 1]
+		if is_float_within(candidate_proportion_1, 0.0, 1.0):
+			intersection_x1 = candidate_x1
+			intersection_y1 = candidate_y1
+			intersection_proportion_1 = candidate_proportion_1
+			count += 1
+
+		if is_float_within(candidate_proportion_2, 0.0, 1.0):
+			if count == 0:
+				intersection_x1 = candidate_x2
+				intersection_y1 = candidate_y2
+				intersection_proportion_1 = candidate_proportion_2
+			else:
+				intersection_x2 = candidate_x2
+				intersection_y2 = candidate_y2
+				intersection_proportion_2 = candidate_proportion_2
+
+			count += 1
+
+	return (count, intersection_x1, intersection_y1, intersection_proportion_1, intersection_x2, intersection_y2, intersection_proportion_2)
+
+@njit(cache = True, fastmath = True)
+def intersection_target_point(
+	distances_along_path: np.ndarray,
+	target_velocities: np.ndarray,
+	segment_lengths: np.ndarray,
+	checkpoint_index: int,
+	proportion_of_segment: float,
+	intersection_x: float,
+	intersection_y: float
+) -> tuple[int, bool, float, float, float, float]:
+	"""
+	Returns a target point from an intersection at `proportion_of_segment` along the segment starting at `checkpoint_index`
+	"""
+	velocity_1 = target_velocities[checkpoint_index]
+	velocity_2 = target_velocities[checkpoint_index + 1]
+
+	if checkpoint_index == 0:
+		# Scale first segment velocity by v = x / (a * x + (1 - a)) and to prevent extremely slow start up
+		a = 0.9
+		velocity_scalar = proportion_of_segment / (a * proportion_of_segment + (1.0 - a))
+	else:
+		velocity_scalar = proportion_of_segment
+
+	target_velocity = velocity_1 + velocity_scalar * (velocity_2 - velocity_1)
+	distance_along_path = distances_along_path[checkpoint_index] + proportion_of_segment * segment_lengths[checkpoint_index]
+
+	return (checkpoint_index, False, intersection_x, intersection_y, distance_along_path, target_velocity)
+
+@njit(cache = True, fastmath = True)
+def next_target_point(
+	xs: np.ndarray,
+	ys: np.ndarray,
+	distances_along_path: np.ndarray,
+	target_velocities: np.ndarray,
+	segment_dxs: np.ndarray,
+	segment_dys: np.ndarray,
+	segment_squared_lengths: np.ndarray,
+	segment_lengths: np.ndarray,
+	max_distances_to_end: np.ndarray,
+	position_x: float,
+	position_y: float,
+	current_checkpoint_index: int,
+	current_target_point_distance_along_path: float,
+	look_ahead_distance: float
+) -> tuple[int, bool, float, float, float, float]:
+	"""
+	Returns (checkpoint index, keep current target point, x, y, distance along path, target velocity).
+	When the current target point is kept, the coordinates are NaN.
+	"""
+	last_index = len(xs) - 1
+
+	# If we've seen the end, return the end point as the target point
+	if current_checkpoint_index == last_index:
+		return (last_index, False, xs[last_index], ys[last_index], distances_along_path[last_index], target_velocities[last_index])
+
+	# Check for intersections in current segment:
+	#   - Take the furthest intersection along segment
+	#   - If intersection is further along path than the current target point, choose it to be the next target point
+	count, intersection_x1, intersection_y1, intersection_proportion_1, intersection_x2, intersection_y2, intersection_proportion_2 = line_segment_circle_intersections(
+		xs,
+		ys,
+		segment_dxs,
+		segment_dys,
+		segment_squared_lengths,
+		current_checkpoint_index,
+		position_x,
+		position_y,
+		look_ahead_distance
+	)
+
+	for intersection_index in range(count):
+		if intersection_index == 0:
+			intersection_x, intersection_y, intersection_proportion = intersection_x1, intersection_y1, intersection_proportion_1
+		else:
+			intersection_x, intersection_y, intersection_proportion = intersection_x2, intersection_y2, intersection_proportion_2
+
+		if distances_along_path[current_checkpoint_index] + intersection_proportion * segment_lengths[current_checkpoint_index] > current_target_point_distance_along_path:
+			return intersection_target_point(distances_along_path, target_velocities, segment_lengths, current_checkpoint_index, intersection_proportion, intersection_x, intersection_y)
+
+	# If every remaining waypoint is within `look_ahead_distance` (by the triangle inequality through the end point),
+	# the scan below can only end on the end point, so return it without walking the remaining segments
+	distance_to_end = hypot(xs[last_index] - position_x, ys[last_index] - position_y)
+
+	if distance_to_end + max_distances_to_end[current_checkpoint_index + 1] < look_ahead_distance - 1e-9:
+		return (last_index, False, xs[last_index], ys[last_index], distances_along_path[last_index], target_velocities[last_index])
+
+	# If no intersections in current segment:
+	#   - Find first segment whose end point is at least `look_ahead_distance` away
+	#   - Either a further along intersection exists on this segment,
+	#     or we have an intersection that moves the target point backwards (maintain current target point in this case),
+	#     or we must choose the segment end point
+	squared_look_ahead_distance = look_ahead_distance * look_ahead_distance
+
+	for index in range(current_checkpoint_index + 1, last_index + 1):
+		x2 = xs[index]
+		y2 = ys[index]
+		dx = x2 - position_x
+		dy = y2 - position_y
+
+		if dx * dx + dy * dy > squared_look_ahead_distance:
+			count, intersection_x1, intersection_y1, intersection_proportion_1, intersection_x2, intersection_y2, intersection_proportion_2 = line_segment_circle_intersections(
+				xs,
+				ys,
+				segment_dxs,
+				segment_dys,
+				segment_squared_lengths,
+				index - 1,
+				position_x,
+				position_y,
+				look_ahead_distance
+			)
+
+			if count > 0:
+				for intersection_index in range(count):
+					if intersection_index == 0:
+						intersection_x, intersection_y, intersection_proportion = intersection_x1, intersection_y1, intersection_proportion_1
+					else:
+						intersection_x, intersection_y, intersection_proportion = intersection_x2, intersection_y2, intersection_proportion_2
+
+					if distances_along_path[index - 1] + intersection_proportion * segment_lengths[index - 1] > current_target_point_distance_along_path:
+						return intersection_target_point(distances_along_path, target_velocities, segment_lengths, index - 1, intersection_proportion, intersection_x, intersection_y)
+
+				# No further along intersections exist in the segment, so maintain current target point
+				return (current_checkpoint_index, True, nan, nan, nan, nan)
+			elif current_checkpoint_index == index - 1:
+				# We previously had a target point in this segment, but no longer intersect, so maintain that target point.
+				# This happens when the look-ahead distance shrinks due to angular velocity limitng immediately after
+				# crossing a new checkpoint. This results in zero intersections, but we have a valid target point.
+				return (current_checkpoint_index, True, nan, nan, nan, nan)
+			else:
+				# We're looking beyond the current target segment, and no intersections exist,
+				# so we can choose the segment end point as the target point
+				return (index - 1, False, x2, y2, distances_along_path[index], target_velocities[index])
+
+	# All remaining segment end points are within `look_ahead_distance`,
+	# so return the end point as the target point
+	return (last_index, False, xs[last_index], ys[last_index], distances_along_path[last_index], target_velocities[last_index])
+
+#
+# Reference Point
+#
+@njit(cache = True, fastmath = True)
+def next_reference_point(
+	xs: np.ndarray,
+	ys: np.ndarray,
+	distances_along_path: np.ndarray,
+	segment_dxs: np.ndarray,
+	segment_dys: np.ndarray,
+	segment_squared_lengths: np.ndarray,
+	segment_lengths: np.ndarray,
+	position_x: float,
+	position_y: float,
+	current_reference_point_index: int,
+	current_reference_point_distance_along_path: float,
+	checkpoint_index: int,
+	max_search_window: int,
+	inverse_total_distance: float
+) -> tuple[bool, int, float, float, float]:
+	"""
+	Returns (found, segment index, x, y, distance along path) of the best scoring orthogonal projection of the position
+	onto the segments between the current reference point and the checkpoint, at most `max_search_window` segments ahead.
+	Segments past the next one are only searched when neither the current nor the next segment has a forward projection,
+	so on a path that bends back, a later segment in the window that would score better can be skipped.
+	When no projection moves forward along the path, `found` is false and the coordinates are NaN.
+	"""
+	found = False
+	best_index = current_reference_point_index
+	best_x = nan
+	best_y = nan
+	best_distance_along_path = nan
+	best_inverse_score = 0.0
+
+	# Bound the window, so a later segment that crosses back near the robot can't be chosen
+	max_index = min(checkpoint_index, len(xs) - 2, current_reference_point_index + max_search_window)
+
+	for index in range(current_reference_point_index, max_index + 1):
+		# Usually the projection is on the current or next segment, so only search further along when neither contains it
+		if found and index > current_reference_point_index + 1:
+			break
+
+		ax = xs[index]
+		ay = ys[index]
+		segment_x = segment_dxs[index]
+		segment_y = segment_dys[index]
+
+		proportion_of_segment = ((position_x - ax) * segment_x + (position_y - ay) * segment_y) / segment_squared_lengths[index]
+
+		if is_float_within(proportion_of_segment, 0.0, 1.0):
+			orthogonal_x = ax + proportion_of_segment * segment_x
+			orthogonal_y = ay + proportion_of_segment * segment_y
+
+			# The projection is this proportion of the way along the segment, so its distance from the segment start needs no square root
+			distance_along_path = distances_along_path[index] + proportion_of_segment * segment_lengths[index]
+
+			if distance_along_path > current_reference_point_distance_along_path:
+				pose_distance = hypot(position_x - orthogonal_x, position_y - orthogonal_y)
+
+				# Score reference point estimates by how close the pose is and how near they are down the path length.
+				# This hopefully prevents problems with intersecting paths and being closer to a later, overlapping segment.
+				inverse_score = (0.75 * pose_distance + 0.6 * distance_along_path * inverse_total_distance)
+
+				if not(found) or inverse_score < best_inverse_score:
+					found = True
+					best_index = index
+					best_x = orthogonal_x
+					best_y = orthogonal_y
+					best_distance_along_path = distance_along_path
+					best_inverse_score = inverse_score
+
+	return (found, best_index, best_x, best_y, best_distance_along_path)
+
+#
+# Cross Track Error
+#
+@njit(cache = True, fastmath = True)
+def calculate_cross_track_error(
+	xs: np.ndarray,
+	ys: np.ndarray,
+	segment_dxs: np.ndarray,
+	segment_dys: np.ndarray,
+	segment_index: int,
+	position_x: float,
+	position_y: float,
+	reference_x: float,
+	reference_y: float
+) -> float:
+	"""
+	Returns the distance from the position to the reference point, positive if the position is collinear with or right of the segment
+	"""
+	orientation = sgn((position_x - xs[segment_index]) * segment_dys[segment_index] - (position_y - ys[segment_index]) * segment_dxs[segment_index])
+
+	return orientation * hypot(position_x - reference_x, position_y - reference_y)
+
+#
+# Curvature
+#
+@njit(cache = True, fastmath = True)
+def calculate_signed_curvature(position_x: float, position_y: float, heading: float, target_x: float, target_y: float) -> float:
+	"""
+	Radius of rotation: R = l^2 / 2·d
+	where l is distance to target point and d is orthogonal distance from target point to robot heading vector
+
+	Curvature: C = 1 / R
+
+	Result is positive if target point is to the right of robot heading vector
+	"""
+	dx = target_x - position_x
+	dy = target_y - position_y
+	squared_distance_to_target_point = dx * dx + dy * dy
+
+	# Heading vector as the line from the position to a point one unit along the heading
+	heading_x = position_x + cos(heading)
+	heading_y = position_y + sin(heading)
+
+	orientation = sgn(dx * (heading_y - position_y) - dy * (heading_x - position_x))
+
+	a = -(heading_y - position_y)
+	b = heading_x - position_x
+	c = position_x * heading_y - heading_x * position_y
+
+	orthogonal_distance = fabs(a * target_x + b * target_y + c) / sqrt(a * a + b * b)
+
+	return (2.0 * (orientation * orthogonal_distance)) / squared_distance_to_target_point
+
+#
+# Look-ahead Distance
+#
+@njit(cache = True)
+def calculate_look_ahead_distance(
+	velocity: float,
+	current_checkpoint_index: int,
+	last_segment_index: int,
+	last_segment_target_velocity: float,
+	inverse_max_velocity: float,
+	min_look_ahead_distance: float,
+	look_ahead_distance_range: float
+) -> float:
+
+	if current_checkpoint_index < last_segment_index:
+		velocity_term = velocity
+	else:
+		velocity_term = max(velocity, last_segment_target_velocity)
+
+	return min_look_ahead_distance + velocity_term * inverse_max_velocity * look_ahead_distance_range
+
+#
+# End Conditions
+#
+@njit(cache = True)
+def handle_end_conditions(
+	position_x: float,
+	position_y: float,
+	velocity: float,
+	target_x: float,
+	target_y: float,
+	end_x: float,
+	end_y: float,
+	final_approach_velocity: float,
+	squared_end_condition_distance: float,
+	previous_squared_distance_remaining: float,
+	dt: float
+) -> tuple[float, bool, float]:
+	"""
+	Returns (target velocity, is path complete, squared distance remaining)
+	"""
+	# Compare squared distances, only taking the square root when decelerating
+	dx = end_x - position_x
+	dy = end_y - position_y
+	squared_distance_remaining = dx * dx + dy * dy
+
+	if squared_distance_remaining < squared_end_condition_distance:
+		return (0.0, True, squared_distance_remaining)
+
+	if is_float_equal(target_x, end_x) and is_float_equal(target_y, end_y) and (squared_distance_remaining > previous_squared_distance_remaining):
+		return (0.0, True, squared_distance_remaining)
+
+	final_deceleration = -velocity * velocity / (2.0 * sqrt(squared_distance_remaining))
+	velocity_delta = final_deceleration * dt
+
+	return (max(velocity + velocity_delta, final_approach_velocity), False, squared_distance_remaining)
+
+#
+# Command Creation
+#
+@njit(cache = True)
+def constrain(value: float, min_value: float, max_value: float) -> float:
+	if value < min_value:
+		return min_value
+	elif value > max_value:
+		return max_value
+	else:
+		return value
+
+@njit(cache = True)
+def limit_velocity(velocity: float, target_velocity: float, max_velocity: float, max_acceleration: float, dt: float) -> float:
+	limited_velocity = constrain(target_velocity, 0.0, max_velocity)
+
+	max_velocity_delta = max_acceleration * dt
+	velocity_delta = constrain(limited_velocity - velocity, -max_velocity_delta, max_velocity_delta)
+
+	return velocity + velocity_delta
+
+@njit(cache = True)
+def limit_angular_velocity(
+	angular_velocity: float,
+	target_angular_velocity: float,
+	max_angular_velocity: float,
+	max_angular_acceleration: float,
+	dt: float
+) -> float:
+
+	limited_angular_velocity = constrain(target_angular_velocity, -max_angular_velocity, max_angular_velocity)
+
+	max_angular_velocity_delta = max_angular_acceleration * dt
+	angular_velocity_delta = constrain(limited_angular_velocity - angular_velocity, -max_angular_velocity_delta, max_angular_velocity_delta)
+
+	return angular_velocity + angular_velocity_delta
+
+@njit(cache = True)
+def create_command(
+	velocity: float,
+	angular_velocity: float,
+	signed_curvature: float,
+	target_velocity: float,
+	max_velocity: float,
+	max_acceleration: float,
+	max_angular_velocity: float,
+	max_angular_acceleration: float,
+	track_width: float,
+	inverse_track_width: float,
+	inverse_wheel_radius: float,
+	dt: float
+) -> tuple[float, float]:
+	"""
+	Returns (right wheel angular velocity, left wheel angular velocity) driving along the curvature within the robot's limits
+	"""
+	limited_target_velocity = max_angular_velocity / fabs(signed_curvature) if signed_curvature != 0.0 else max_velocity
+
+	limited_velocity = limit_velocity(velocity, min(target_velocity, limited_target_velocity), max_velocity, max_acceleration, dt)
+
+	limited_right_wheel_velocity = 0.5 * limited_velocity * (2.0 - track_width * signed_curvature)
+	limited_left_wheel_velocity = 0.5 * limited_velocity * (2.0 + track_width * signed_curvature)
+
+	target_angular_velocity = (limited_right_wheel_velocity - limited_left_wheel_velocity) * inverse_track_width
+
+	limited_angular_velocity = limit_angular_velocity(angular_velocity, target_angular_velocity, max_angular_velocity, max_angular_acceleration, dt)
+
+	right_wheel_velocity = limited_velocity + 0.5 * limited_angular_velocity * track_width
+	left_wheel_velocity = limited_velocity - 0.5 * limited_angular_velocity * track_width
+
+	return (right_wheel_velocity * inverse_wheel_radius, left_wheel_velocity * inverse_wheel_radius)
+
+#
+# Update
+#
+# Controller constants passed to `update`, in order:
+#   min look-ahead distance, look-ahead distance range, inverse max velocity, max reference search window,
+#   inverse total distance, final approach velocity, squared end condition distance,
+#   max velocity, max acceleration, max angular velocity, max angular acceleration,
+#   track width, inverse track width, inverse wheel radius
+#
+UpdateParameters = tuple[float, float, float, int, float, float, float, float, float, float, float, float, float, float]
+
+# Controller state carried between steps, in order:
+#   checkpoint index, target x, y, distance along path, velocity (NaN x, y and velocity before the first step),
+#   reference point index, reference x, y, distance along path,
+#   cross track error, look-ahead distance, previous squared distance remaining, is path complete
+#
+UpdateState = tuple[int, float, float, float, float, int, float, float, float, float, float, float, bool]
+
+@njit(cache = True)
+def update(
+	xs: np.ndarray,
+	ys: np.ndarray,
+	distances_along_path: np.ndarray,
+	target_velocities: np.ndarray,
+	segment_dxs: np.ndarray,
+	segment_dys: np.ndarray,
+	segment_squared_lengths: np.ndarray,
+	segment_lengths: np.ndarray,
+	max_distances_to_end: np.ndarray,
+	parameters: UpdateParameters,
+	position_x: float,
+	position_y: float,
+	heading: float,
+	velocity: float,
+	angular_velocity: float,
+	dt: float,
+	current_checkpoint_index: int,
+	current_target_point_x: float,
+	current_target_point_y: float,
+	current_target_point_distance_along_path: float,
+	current_target_point_velocity: float,
+	current_reference_point_index: int,
+	current_reference_point_x: float,
+	current_reference_point_y: float,
+	current_reference_point_distance_along_path: float,
+	previous_squared_distance_remaining: float
+) -> tuple[int, bool, float, float, float, float, int, bool, float, float, float, float, float, bool, float, float, float]:
+	"""
+	One controller step on an incomplete path, from the pose and the previous step's state (with a NaN target point before the first step).
+	Returns (checkpoint index, is target point kept, target x, y, distance along path, velocity,
+	reference point index, is reference point found, reference x, y, distance along path,
+	cross track error, look-ahead distance, is path complete, squared distance remaining,
+	right wheel angular velocity, left wheel angular velocity)
+	"""
+	(
+		min_look_ahead_distance,
+		look_ahead_distance_range,
+		inverse_max_velocity,
+		max_reference_search_window,
+		inverse_total_distance,
+		final_approach_velocity,
+		squared_end_condition_distance,
+		max_velocity,
+		max_acceleration,
+		max_angular_velocity,
+		max_angular_acceleration,
+		track_width,
+		inverse_track_width,
+		inverse_wheel_radius
+	) = parameters
+
+	last_segment_index = len(xs) - 2
+
+	# Calculate look-ahead distance based on velocity
+	look_ahead_distance = calculate_look_ahead_distance(
+		velocity,
+		current_checkpoint_index,
+		last_segment_index,
+		target_velocities[last_segment_index],
+		inverse_max_velocity,
+		min_look_ahead_distance,
+		look_ahead_distance_range
+	)
+
+	# Search for next target point
+	checkpoint_index, is_target_point_kept, target_x, target_y, target_distance_along_path, target_velocity = next_target_point(
+		xs,
+		ys,
+		distances_along_path,
+		target_velocities,
+		segment_dxs,
+		segment_dys,
+		segment_squared_lengths,
+		segment_lengths,
+		max_distances_to_end,
+		position_x,
+		position_y,
+		current_checkpoint_index,
+		current_target_point_distance_along_path,
+		look_ahead_distance
+	)
+
+	if is_target_point_kept:
+		target_x = current_target_point_x
+		target_y = current_target_point_y
+		target_distance_along_path = current_target_point_distance_along_path
+		target_velocity = current_target_point_velocity
+
+	# Calculate reference point and cross track error
+	is_reference_point_found, reference_point_index, reference_x, reference_y, reference_distance_along_path = next_reference_point(
+		xs,
+		ys,
+		distances_along_path,
+		segment_dxs,
+		segment_dys,
+		segment_squared_lengths,
+		segment_lengths,
+		position_x,
+		position_y,
+		current_reference_point_index,
+		current_reference_point_distance_along_path,
+		checkpoint_index,
+		max_reference_search_window,
+		inverse_total_distance
+	)
+
+	if not(is_reference_point_found):
+		reference_point_index = current_reference_point_index
+		reference_x = current_reference_point_x
+		reference_y = current_reference_point_y
+		reference_distance_along_path = current_reference_point_distance_along_path
+
+	cross_track_error = calculate_cross_track_error(xs, ys, segment_dxs, segment_dys, reference_point_index, position_x, position_y, reference_x, reference_y)
+
+	# Calculate target velocities and handle end conditions
+	commanded_velocity = target_velocity
+	is_path_complete = False
+	squared_distance_remaining = previous_squared_distance_remaining
+
+	if checkpoint_index >= last_segment_index:
+		commanded_velocity, is_path_complete, squared_distance_remaining = handle_end_conditions(
+			position_x,
+			position_y,
+			velocity,
+			target_x,
+			target_y,
+			xs[-1],
+			ys[-1],
+			final_approach_velocity,
+			squared_end_condition_distance,
+			previous_squared_distance_remaining,
+			dt
+		)
+
+	# Create command to drive along curvature, or to stop if the path was just completed
+	right_wheel_angular_velocity = 0.0
+	left_wheel_angular_velocity = 0.0
+
+	if not(is_path_complete):
+		signed_curvature = calculate_signed_curvature(position_x, position_y, heading, target_x, target_y)
+
+		right_wheel_angular_velocity, left_wheel_angular_velocity = create_command(
+			velocity,
+			angular_velocity,
+			signed_curvature,
+			commanded_velocity,
+			max_velocity,
+			max_acceleration,
+			max_angular_velocity,
+			max_angular_acceleration,
+			track_width,
+			inverse_track_width,
+			inverse_wheel_radius,
+			dt
+		)
+
+	return (
+		checkpoint_index,
+		is_target_point_kept,
+		target_x,
+		target_y,
+		target_distance_along_path,
+		target_velocity,
+		reference_point_index,
+		is_reference_point_found,
+		reference_x,
+		reference_y,
+		reference_distance_along_path,
+		cross_track_error,
+		look_ahead_distance,
+		is_path_complete,
+		squared_distance_remaining,
+		right_wheel_angular_velocity,
+		left_wheel_angular_velocity
+	)
@@ -9,6 +9,7 @@ from typing import Optional
 from math import cos, sin
 
 from pure_pursuit.utilities.geometry import Point
+from pure_pursuit.utilities.jit import njit
 from pure_pursuit.model.robot import Robot, RobotPose, RobotCommand
 
 #
@@ -18,16 +19,46 @@ def propagate_pose(robot: Robot, previous_pose: RobotPose, previous_command: Opt
     if previous_command is None:
         return previous_pose
 
-    velocity = robot.wheel_radius * (previous_command.right_wheel_angular_velocity + previous_command.left_wheel_angular_velocity) / 2.0
-
-    angular_velocity = robot.wheel_radius * (previous_command.right_wheel_angular_velocity - previous_command.left_wheel_angular_velocity) / robot.track_width
+    x, y, heading, velocity, angular_velocity = propagate_state(
+        previous_pose.position.x,
+        previous_pose.position.y,
+        previous_pose.heading,
+        previous_command.right_wheel_angular_velocity,
+        previous_command.left_wheel_angular_velocity,
+        robot.wheel_radius,
+        robot.track_width,
+        dt
+    )
 
     return RobotPose(
-        position = Point(
-            x = previous_pose.position.x + cos(previous_pose.heading) * velocity * dt,
-            y = previous_pose.position.y + sin(previous_pose.heading) * velocity * dt
-        ),
-        heading = previous_pose.heading + angular_velocity * dt,
+        position = Point(x = x, y = y),
+        heading = heading,
         velocity = velocity,
         angular_velocity = angular_velocity
     )
+
+@njit(cache = True)
+def propagate_state(
+    x: float,
+    y: float,
+    heading: float,
+    right_wheel_angular_velocity: float,
+    left_wheel_angular_velocity: float,
+    wheel_radius: float,
+    track_width: float,
+    dt: float
+) -> tuple[float, float, float, float, float]:
+    """
+    Scalar form of propagate_pose, returning (x, y, heading, velocity, angular velocity)
+    """
+    velocity = wheel_radius * (right_wheel_angular_velocity + left_wheel_angular_velocity) / 2.0
+
+    angular_velocity = wheel_radius * (right_wheel_angular_velocity - left_wheel_angular_velocity) / track_width
+
+    return (
+        x + cos(heading) * velocity * dt,
+        y + sin(heading) * velocity * dt,
+        heading + angular_velocity * dt,
+        velocity,
+        angular_velocity
+    )
@@ -5,6 +5,8 @@
 # Created by Christian Bator on 01/02/2025
 #
 
+from dataclasses import dataclass
+
 from pure_pursuit.config.robot_config import RobotConfig
 from pure_pursuit.utilities.geometry import Point
 
@@ -53,29 +55,12 @@ class Robot:
 #
 # RobotPose
 #
+@dataclass(slots = True)
 class RobotPose:
-
-    def __init__(self, position: Point, heading: float, velocity: float, angular_velocity: float):
-        self._position = position
-        self._heading = heading
-        self._velocity = velocity
-        self._angular_velocity = angular_velocity
-
-    @property 
-    def position(self) -> Point:
-        return self._position
-
-    @property
-    def heading(self) -> float:
-        return self._heading
-
-    @property
-    def velocity(self) -> float:
-        return self._velocity
-
-    @property
-    def angular_velocity(self) -> float:
-        return self._angular_velocity
+    position: Point
+    heading: float
+    velocity: float
+    angular_velocity: float
 
     def right_wheel_angular_velocity(self, robot: Robot) -> float:
         return (self.velocity + 0.5 * self.angular_velocity * robot.track_width) / robot.wheel_radius
@@ -89,19 +74,10 @@ class RobotPose:
 #
 # RobotCommand
 #
+@dataclass(slots = True)
 class RobotCommand:
-
-    def __init__(self, right_wheel_angular_velocity: float, left_wheel_angular_velocity: float):
-        self._right_wheel_angular_velocity = right_wheel_angular_velocity
-        self._left_wheel_angular_velocity = left_wheel_angular_velocity
-
-    @property
-    def right_wheel_angular_velocity(self) -> float:
-        return self._right_wheel_angular_velocity
-
-    @property
-    def left_wheel_angular_velocity(self) -> float:
-        return self._left_wheel_angular_velocity
+    right_wheel_angular_velocity: float
+    left_wheel_angular_velocity: float
 
     def __str__(self) -> str:
         return f"(r: {self.right_wheel_angular_velocity:0,.3f}, l: {self.left_wheel_angular_velocity:0,.3f})"
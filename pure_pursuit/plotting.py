@@ -5,37 +5,45 @@
 # Created by Christian Bator on 01/03/2025
 #
 
+from typing import TYPE_CHECKING
 from math import ceil, floor
 
 from pure_pursuit.simulation.simulation_data import SimulationData
 
-from matplotlib import pyplot as plot
-from matplotlib.figure import Figure
+import numpy as np
+
+# Matplotlib is imported when plotting, so importing the package without plotting doesn't load it
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
 #
 # Plotting
 #
-def plot_cross_track_errors(simulation_data: SimulationData) -> Figure:
+def plot_cross_track_errors(simulation_data: SimulationData) -> "Figure":
+    from matplotlib import pyplot as plot
+
     figure = plot.figure("Cross Track Errors", figsize = (10, 6))
     axes = figure.add_subplot(111)
 
-    x_data = range(0, len(simulation_data.cross_track_errors))
+    # Convert meters to centimeters
+    error_scalar = 100.0 
+
+    errors = simulation_data.cross_track_errors * error_scalar
+
+    x_data = np.arange(len(errors))
 
     axes.plot(
         x_data, 
-        [0] * len(simulation_data.cross_track_errors)
+        np.zeros(len(errors))
     )
 
-    # Convert meters to centimeters
-    error_scalar = 100.0 
-
     axes.plot(
         x_data,
-        [error * error_scalar for error in simulation_data.cross_track_errors]
+        errors
     )
 
-    y_min = min(simulation_data.cross_track_errors) * error_scalar
-    y_max = max(simulation_data.cross_track_errors) * error_scalar
+    y_min = float(errors.min())
+    y_max = float(errors.max())
 
     buffer = 1.2
     axes.set_ylim((buffer * y_min, buffer * y_max))
@@ -5,25 +5,16 @@
 # Created by Christian Bator on 01/03/2025
 #
 
-import json
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from argparse import ArgumentParser
 from pathlib import Path
 
-from pure_pursuit.config.robot_config import RobotConfig
-from pure_pursuit.config.pure_pursuit_config import PurePursuitConfig
-from pure_pursuit.config.simulation_config import SimulationConfig
-from pure_pursuit.controller.pure_pursuit_controller import PurePursuitController
-from pure_pursuit.controller.path_adapter import PathAdapter
-from pure_pursuit.model.robot import Robot, RobotPose
-from pure_pursuit.simulation.simulator import Simulator
-from pure_pursuit.animation.animator import Animator
-from pure_pursuit.plotting import plot_cross_track_errors
-from pure_pursuit.utilities.geometry import Point, line_segment_angle
+from pure_pursuit.simulation.simulation_job import SimulationJob, load_configs, load_path, create_simulator, save_cross_track_errors
 from pure_pursuit.utilities.print_colors import cyan
 
-from matplotlib import pyplot as plot
-from matplotlib.animation import FuncAnimation
+# Plotting and animation are imported on demand, so a headless simulation run doesn't load matplotlib
+if TYPE_CHECKING:
+    from matplotlib.animation import FuncAnimation
 
 #
 # Constants
@@ -31,9 +22,10 @@ from matplotlib.animation import FuncAnimation
 OUTPUT_DIR = Path("output")
 RESULT_DIR = OUTPUT_DIR / "results"
 ANIMATION_DIR = OUTPUT_DIR / "animations"
+CACHE_DIR = OUTPUT_DIR / "cache"
 
 is_paused = False
-animation: Optional[FuncAnimation] = None
+animation: Optional["FuncAnimation"] = None
 
 #
 # Main
@@ -53,80 +45,44 @@ def main():
     parser.add_argument("--save-animation", action = "store_true")
     parser.add_argument("--quiet", action = "store_true")
     parser.add_argument("--graphs", action = "store_true")
+    parser.add_argument("--no-cache", action = "store_true")
     args = parser.parse_args()
 
-    simulation_config: Optional[SimulationConfig] = None
-    with open(args.simulation_config_filepath) as simulation_config_file:
-        simulation_config_json = json.load(simulation_config_file)
-        simulation_config = SimulationConfig.decode(simulation_config_json)
+    # Decoded configs and the adapted path are cached by the contents of their input files
+    cache_dir = None if args.no_cache else CACHE_DIR
 
-    if not simulation_config:
-        print("> Error: Invalid simulation config")
-        exit(2)
-
-    robot_config: Optional[RobotConfig] = None
-    with open(args.robot_config_filepath) as robot_config_file:
-        robot_config_json = json.load(robot_config_file)
-        robot_config = RobotConfig.decode(robot_config_json)
-
-    if not robot_config:
-        print("> Error: Invalid robot config")
-        exit(2)
-
-    pure_pursuit_config: Optional[PurePursuitConfig] = None
-    with open(args.pure_pursuit_config_filepath) as pure_pursuit_config_file:
-        pure_pursuit_config_json = json.load(pure_pursuit_config_file)
-        pure_pursuit_config = PurePursuitConfig.decode(pure_pursuit_config_json)
+    job = SimulationJob(
+        path_filepath = Path(args.path_filepath),
+        simulation_config_filepath = Path(args.simulation_config_filepath),
+        robot_config_filepath = Path(args.robot_config_filepath),
+        pure_pursuit_config_filepath = Path(args.pure_pursuit_config_filepath)
+    )
 
-    if not pure_pursuit_config:
-        print("> Error: Invalid pure pursuit config")
+    try:
+        simulation_config, robot_config, pure_pursuit_config = load_configs(job = job, cache_dir = cache_dir)
+    except ValueError as error:
+        print(f"> Error: {error}")
         exit(2)
 
     #
     # Initialization
     #
-    path_filepath = Path(args.path_filepath)
-    
-    with open(path_filepath) as path_file:
-        path_data = json.load(path_file)
-
-    raw_points = [Point(x = point["x"], y = point["y"]) for point in path_data]
+    path = load_path(job = job, robot_config = robot_config, pure_pursuit_config = pure_pursuit_config, cache_dir = cache_dir)
 
-    # Pre-process path by calculating target velocities based on configuration parameters and acceleration limits
-    path = PathAdapter(raw_points = raw_points).adapt_path(
-        max_velocity = robot_config.max_velocity,
-        max_acceleration = robot_config.max_acceleration,
-        angle_velocity_parameter = pure_pursuit_config.angle_velocity_parameter
+    simulator = create_simulator(
+        simulation_config = simulation_config,
+        robot_config = robot_config,
+        pure_pursuit_config = pure_pursuit_config,
+        path = path
     )
 
-    # Create robot
-    robot = Robot(config = robot_config)
-    
-    # Set initial pose to the first point on the path
-    initial_pose = RobotPose(
-        position = raw_points[0],
-        heading = line_segment_angle([raw_points[0], raw_points[1]]),
-        velocity = 0.0,
-        angular_velocity = 0.0
-    )
+    robot = simulator.robot
+    controller = simulator.controller
 
-    # Create controller
-    controller = PurePursuitController(config = pure_pursuit_config, robot = robot, path = path)
-    
     #
     # Simulate
     #
-    dt = 1.0 / simulation_config.control_frequency
-
-    simulator = Simulator(
-        robot = robot,
-        initial_pose = initial_pose,
-        controller = controller,
-        dt = dt,
-        path = path
-    )
-
-    path_name = path_filepath.stem
+    path_name = job.path_name
     print(f"> Simulating {cyan(path_name)} ...")
 
     simulation_data = simulator.simulate()
@@ -134,14 +90,11 @@ def main():
     print("  > Done")
     print(simulation_data.result_text(avg_abs_cross_track_error_threshold = simulation_config.avg_abs_cross_track_error_threshold))
 
-    result_filepath = RESULT_DIR / f"{path_filepath.stem}.json"
+    result_filepath = RESULT_DIR / f"{path_name}.npy"
 
     print(f"> Saving output to {result_filepath} ...")
-    
-    RESULT_DIR.mkdir(parents = True, exist_ok = True)
 
-    with open(result_filepath, "w") as result_file:
-        json.dump(simulation_data.cross_track_errors, result_file, indent = 4, sort_keys = True)
+    save_cross_track_errors(filepath = result_filepath, cross_track_errors = simulation_data.cross_track_errors)
 
     print("  > Done")
 
@@ -151,6 +104,8 @@ def main():
     graph_figure = None
 
     if args.graphs:
+        from pure_pursuit.plotting import plot_cross_track_errors
+
         graph_figure = plot_cross_track_errors(simulation_data = simulation_data)
 
     #
@@ -159,6 +114,9 @@ def main():
     animation_figure = None
 
     if args.animate:
+        from pure_pursuit.animation.animator import Animator
+        from matplotlib import pyplot as plot
+
         animator = Animator(
             robot = robot,
             controller = controller,
@@ -168,20 +126,18 @@ def main():
             print_frame_number = args.save_animation
         )
 
-        animation_figure, animation = animator.animate()
-
         if args.save_animation:
             ANIMATION_DIR.mkdir(parents = True, exist_ok = True)
 
             filepath = ANIMATION_DIR / f"{path_name}.mp4"
             print(f"> Saving animation to '{filepath}'...")
 
-            animation.save(filename = filepath, writer = "ffmpeg")
-            plot.close(animation_figure)
-            animation_figure = None
+            animator.save(filepath = filepath)
+            plot.close(animator.figure)
 
             print("  > Done")
         else:
+            animation_figure, animation = animator.animate()
             is_paused = False
 
             def toggle_pause(_):
@@ -201,6 +157,8 @@ def main():
     
     # Show plots
     if graph_figure is not None or animation_figure is not None:
+        from matplotlib import pyplot as plot
+
         plot.show()
 
     return 0
@@ -5,15 +5,18 @@
 # Created by Christian Bator on 01/02/2025
 #
 
-from typing import Optional
-from math import degrees, radians, fabs
+from typing import Optional, Iterator, Sequence, overload
+from math import degrees, radians
 
 from pure_pursuit.model.robot import Robot, RobotPose, RobotCommand
 from pure_pursuit.controller.pure_pursuit_controller import PurePursuitController
-from pure_pursuit.utilities.math_extensions import is_float_less_or_equal, average
-from pure_pursuit.utilities.geometry import TargetPoint, ReferencePoint, Path, distance_between
+from pure_pursuit.simulation import simulation_kernels as columns
+from pure_pursuit.utilities.math_extensions import is_float_less_or_equal
+from pure_pursuit.utilities.geometry import Point, TargetPoint, ReferencePoint, Path, distance_between
 from pure_pursuit.utilities.print_colors import cyan, green, bright_red
 
+import numpy as np
+
 #
 # SimulationState
 #
@@ -50,7 +53,7 @@ class SimulationState:
         return self._cross_track_error
     
     @property
-    def checkpoint_index(self) -> float:
+    def checkpoint_index(self) -> int:
         return self._checkpoint_index
     
     @property
@@ -65,6 +68,124 @@ class SimulationState:
     def command(self) -> RobotCommand:
         return self._command
 
+#
+# SimulationStates
+#
+class SimulationStates(Sequence[SimulationState]):
+    """
+    Simulation states stored as the simulator's `(N, NUM_COLUMNS)` state rows, with `SimulationState` objects only created when accessed.
+    Float64 rows are kept without copying and made read-only.
+    """
+
+    def __init__(self, rows: np.ndarray):
+        self._rows = np.asarray(rows, dtype = np.float64)
+        self._rows.flags.writeable = False
+
+        self._checkpoint_indices = self._rows[:, columns.CHECKPOINT_INDEX].astype(np.int64)
+
+    @property
+    def position_xs(self) -> np.ndarray:
+        return self._rows[:, columns.POSITION_X]
+
+    @property
+    def position_ys(self) -> np.ndarray:
+        return self._rows[:, columns.POSITION_Y]
+
+    @property
+    def headings(self) -> np.ndarray:
+        return self._rows[:, columns.HEADING]
+
+    @property
+    def velocities(self) -> np.ndarray:
+        return self._rows[:, columns.VELOCITY]
+
+    @property
+    def angular_velocities(self) -> np.ndarray:
+        return self._rows[:, columns.ANGULAR_VELOCITY]
+
+    @property
+    def reference_point_xs(self) -> np.ndarray:
+        return self._rows[:, columns.REFERENCE_POINT_X]
+
+    @property
+    def reference_point_ys(self) -> np.ndarray:
+        return self._rows[:, columns.REFERENCE_POINT_Y]
+
+    @property
+    def cross_track_errors(self) -> np.ndarray:
+        return self._rows[:, columns.CROSS_TRACK_ERROR]
+
+    @property
+    def checkpoint_indices(self) -> np.ndarray:
+        return self._checkpoint_indices
+
+    @property
+    def look_ahead_distances(self) -> np.ndarray:
+        return self._rows[:, columns.LOOK_AHEAD_DISTANCE]
+
+    @property
+    def target_point_xs(self) -> np.ndarray:
+        return self._rows[:, columns.TARGET_POINT_X]
+
+    @property
+    def target_point_ys(self) -> np.ndarray:
+        return self._rows[:, columns.TARGET_POINT_Y]
+
+    @property
+    def right_wheel_angular_velocities(self) -> np.ndarray:
+        return self._rows[:, columns.RIGHT_WHEEL_ANGULAR_VELOCITY]
+
+    @property
+    def left_wheel_angular_velocities(self) -> np.ndarray:
+        return self._rows[:, columns.LEFT_WHEEL_ANGULAR_VELOCITY]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @overload
+    def __getitem__(self, index: int) -> SimulationState:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[SimulationState]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> SimulationState | list[SimulationState]:
+        if isinstance(index, slice):
+            return [_simulation_state(row) for row in self._rows[index].tolist()]
+
+        return _simulation_state(self._rows[index].tolist())
+
+    def __iter__(self) -> Iterator[SimulationState]:
+        for row in self._rows.tolist():
+            yield _simulation_state(row)
+
+def _simulation_state(row: list[float]) -> SimulationState:
+    return SimulationState(
+        pose = RobotPose(
+            position = Point(x = row[columns.POSITION_X], y = row[columns.POSITION_Y]),
+            heading = row[columns.HEADING],
+            velocity = row[columns.VELOCITY],
+            angular_velocity = row[columns.ANGULAR_VELOCITY]
+        ),
+        reference_point = ReferencePoint(
+            position = Point(x = row[columns.REFERENCE_POINT_X], y = row[columns.REFERENCE_POINT_Y]),
+            distance_along_path = row[columns.REFERENCE_POINT_DISTANCE_ALONG_PATH]
+        ),
+        cross_track_error = row[columns.CROSS_TRACK_ERROR],
+        checkpoint_index = int(row[columns.CHECKPOINT_INDEX]),
+        look_ahead_distance = row[columns.LOOK_AHEAD_DISTANCE],
+        target_point = TargetPoint(
+            position = Point(x = row[columns.TARGET_POINT_X], y = row[columns.TARGET_POINT_Y]),
+            distance_along_path = row[columns.TARGET_POINT_DISTANCE_ALONG_PATH],
+            target_velocity = row[columns.TARGET_POINT_VELOCITY]
+        ),
+        command = RobotCommand(
+            right_wheel_angular_velocity = row[columns.RIGHT_WHEEL_ANGULAR_VELOCITY],
+            left_wheel_angular_velocity = row[columns.LEFT_WHEEL_ANGULAR_VELOCITY]
+        )
+    )
+
 #
 # SimulationData
 #
@@ -76,22 +197,29 @@ class SimulationData:
         controller: PurePursuitController,
         dt: float,
         path: Path,
-        states: list[SimulationState],
-        step_calculation_times_ns: list[float]
+        states: SimulationStates,
+        num_steps: int,
+        calculation_time_ns: int
     ):
         self._robot = robot
         self._controller = controller
         self._path = path
         self._states = states
-        self._step_calculation_times_ns = step_calculation_times_ns
+        self._num_steps = num_steps
+        self._calculation_time_ns = calculation_time_ns
         self._dt = dt
 
+        # Reduced once, since the report reads each statistic more than once
+        self._average_absolute_cross_track_error = float(np.abs(states.cross_track_errors).mean())
+        self._average_velocity = float(states.velocities.mean())
+        self._max_angular_velocity = float(np.abs(states.angular_velocities).max())
+
     @property
     def path(self) -> Path:
         return self._path
 
     @property
-    def states(self) -> list[SimulationState]:
+    def states(self) -> SimulationStates:
         return self._states
 
     @property
@@ -100,35 +228,37 @@ class SimulationData:
 
     @property
     def path_length(self) -> float:
-        return self._path.end_point.distance_along_path
+        return self._path.total_distance
 
     @property
     def average_waypoint_angle(self) -> float:
-        return average([degrees(fabs(waypoint.angle)) for waypoint in self._path])
+        return degrees(self._path.average_absolute_angle)
 
     @property
     def average_step_calculation_time_ms(self) -> float:
-        return average(self._step_calculation_times_ns) / 1_000_000.0
+        return self._calculation_time_ns / self._num_steps / 1_000_000.0
 
     @property
-    def cross_track_errors(self) -> list[float]:
-        return [state.cross_track_error for state in self._states]
+    def cross_track_errors(self) -> np.ndarray:
+        return self._states.cross_track_errors
 
     @property
     def average_absolute_cross_track_error(self) -> float:
-        return average([fabs(cross_track_error) for cross_track_error in self.cross_track_errors])
+        return self._average_absolute_cross_track_error
 
     @property
     def average_velocity(self) -> float:
-        return average([state.pose.velocity for state in self._states])
+        return self._average_velocity
 
     @property
     def max_angular_velocity(self) -> float:
-        return max([fabs(state.pose.angular_velocity) for state in self._states])
+        return self._max_angular_velocity
 
     @property
     def end_point_distance(self) -> float:
-        return distance_between(self._states[-1].pose.position, self._path.end_point)
+        end_position = Point(x = float(self._states.position_xs[-1]), y = float(self._states.position_ys[-1]))
+
+        return distance_between(end_position, self._path.end_point)
 
     def result_text(self, avg_abs_cross_track_error_threshold: float) -> str:
         result = "> Results:\n"
@@ -0,0 +1,155 @@
+#
+# simulation_job.py
+# pure-pursuit
+#
+# Created by Christian Bator on 10/14/2026
+#
+
+from typing import Optional, TypeVar
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_all_start_methods, get_context
+
+from pure_pursuit.config.robot_config import RobotConfig
+from pure_pursuit.config.pure_pursuit_config import PurePursuitConfig
+from pure_pursuit.config.simulation_config import SimulationConfig
+from pure_pursuit.controller.pure_pursuit_controller import PurePursuitController
+from pure_pursuit.controller.path_adapter import PathAdapter
+from pure_pursuit.model.robot import Robot, RobotPose
+from pure_pursuit.simulation.simulator import Simulator
+from pure_pursuit.utilities.geometry import Point, Path as GeoPath, line_segment_angle_xy
+from pure_pursuit.utilities.file_cache import load_cached_json
+from pure_pursuit.utilities.json_codable import JSONDecodable
+from pure_pursuit.utilities.json_io import parse_json
+
+import numpy as np
+
+D = TypeVar("D", bound = JSONDecodable)
+
+#
+# SimulationJob
+#
+@dataclass(frozen = True, slots = True)
+class SimulationJob:
+
+    path_filepath: Path
+    simulation_config_filepath: Path
+    robot_config_filepath: Path
+    pure_pursuit_config_filepath: Path
+
+    @property
+    def path_name(self) -> str:
+        return self.path_filepath.stem
+
+#
+# SimulationSummary
+#
+@dataclass(frozen = True, slots = True)
+class SimulationSummary:
+
+    path_name: str
+    result_text: str
+    cross_track_errors: np.ndarray
+
+#
+# Loading
+#
+def load_config(cache_dir: Optional[Path], filepath: Path, config_type: type[D], name: str) -> D:
+    """
+    Loads one config, raising a `ValueError` naming the config when its JSON is malformed or has missing or invalid values
+    """
+    try:
+        return load_cached_json(cache_dir, filepath, config_type)
+    except (KeyError, TypeError, ValueError) as error:
+        raise ValueError(f"Invalid {name} config: {error!r}") from error
+
+def load_configs(job: SimulationJob, cache_dir: Optional[Path]) -> tuple[SimulationConfig, RobotConfig, PurePursuitConfig]:
+    """
+    Loads the job's configs, raising a `ValueError` for an invalid config
+    """
+    simulation_config = load_config(cache_dir, job.simulation_config_filepath, SimulationConfig, "simulation")
+    robot_config = load_config(cache_dir, job.robot_config_filepath, RobotConfig, "robot")
+    pure_pursuit_config = load_config(cache_dir, job.pure_pursuit_config_filepath, PurePursuitConfig, "pure pursuit")
+
+    return (simulation_config, robot_config, pure_pursuit_config)
+
+def load_path(job: SimulationJob, robot_config: RobotConfig, pure_pursuit_config: PurePursuitConfig, cache_dir: Optional[Path]) -> GeoPath:
+    with open(job.path_filepath, "rb") as path_file:
+        path_data = parse_json(path_file.read())
+
+    xs = np.fromiter((point["x"] for point in path_data), dtype = np.float64, count = len(path_data))
+    ys = np.fromiter((point["y"] for point in path_data), dtype = np.float64, count = len(path_data))
+
+    # Pre-process path by calculating target velocities based on configuration parameters and acceleration limits
+    return PathAdapter.from_coordinates(xs = xs, ys = ys).adapt_path(
+        max_velocity = robot_config.max_velocity,
+        max_acceleration = robot_config.max_acceleration,
+        angle_velocity_parameter = pure_pursuit_config.angle_velocity_parameter,
+        simplify_epsilon = pure_pursuit_config.simplify_epsilon,
+        cache_dir = cache_dir
+    )
+
+def create_simulator(simulation_config: SimulationConfig, robot_config: RobotConfig, pure_pursuit_config: PurePursuitConfig, path: GeoPath) -> Simulator:
+    # Create robot
+    robot = Robot(config = robot_config)
+
+    # Set initial pose to the first point on the path
+    initial_pose = RobotPose(
+        position = Point(x = path.start_point.x, y = path.start_point.y),
+        heading = line_segment_angle_xy(path.xs[0], path.ys[0], path.xs[1], path.ys[1]),
+        velocity = 0.0,
+        angular_velocity = 0.0
+    )
+
+    # Create controller
+    controller = PurePursuitController(config = pure_pursuit_config, robot = robot, path = path)
+
+    return Simulator(
+        robot = robot,
+        initial_pose = initial_pose,
+        controller = controller,
+        dt = 1.0 / simulation_config.control_frequency,
+        path = path
+    )
+
+#
+# Results
+#
+def save_cross_track_errors(filepath: Path, cross_track_errors: np.ndarray):
+    """
+    Saves the cross track errors as a float32 `.npy` array, which is plenty of precision for errors in meters
+    """
+    filepath.parent.mkdir(parents = True, exist_ok = True)
+
+    np.save(filepath, np.asarray(cross_track_errors, dtype = np.float32))
+
+#
+# Running
+#
+def run_simulation(job: SimulationJob, cache_dir: Optional[Path] = None) -> SimulationSummary:
+    """
+    Simulates a single job, returning only its summary so results are cheap to send between processes
+    """
+    simulation_config, robot_config, pure_pursuit_config = load_configs(job = job, cache_dir = cache_dir)
+    path = load_path(job = job, robot_config = robot_config, pure_pursuit_config = pure_pursuit_config, cache_dir = cache_dir)
+    simulator = create_simulator(simulation_config = simulation_config, robot_config = robot_config, pure_pursuit_config = pure_pursuit_config, path = path)
+
+    simulation_data = simulator.simulate()
+
+    return SimulationSummary(
+        path_name = job.path_name,
+        result_text = simulation_data.result_text(avg_abs_cross_track_error_threshold = simulation_config.avg_abs_cross_track_error_threshold),
+        cross_track_errors = simulation_data.cross_track_errors
+    )
+
+def run_simulations(jobs: list[SimulationJob], max_workers: Optional[int] = None, cache_dir: Optional[Path] = None) -> list[SimulationSummary]:
+    """
+    Simulates independent jobs in parallel worker processes, returning their summaries in job order.
+    Workers are forked where supported, so they start with the parent's imported modules.
+    """
+    start_method = "fork" if "fork" in get_all_start_methods() else None
+
+    with ProcessPoolExecutor(max_workers = max_workers, mp_context = get_context(start_method)) as executor:
+        return list(executor.map(partial(run_simulation, cache_dir = cache_dir), jobs))
@@ -0,0 +1,261 @@
+#
+# simulation_kernels.py
+# pure-pursuit
+#
+# Created by Christian Bator on 10/14/2026
+#
+
+from pure_pursuit.controller.pure_pursuit_kernels import UpdateParameters, UpdateState, update
+from pure_pursuit.model.diff_drive_kinematics import propagate_state
+from pure_pursuit.utilities.jit import njit
+
+import numpy as np
+
+#
+# State Columns
+#
+# Each simulation state is one row of floats, in this column order
+#
+POSITION_X = 0
+POSITION_Y = 1
+HEADING = 2
+VELOCITY = 3
+ANGULAR_VELOCITY = 4
+REFERENCE_POINT_X = 5
+REFERENCE_POINT_Y = 6
+REFERENCE_POINT_DISTANCE_ALONG_PATH = 7
+CROSS_TRACK_ERROR = 8
+CHECKPOINT_INDEX = 9
+LOOK_AHEAD_DISTANCE = 10
+TARGET_POINT_X = 11
+TARGET_POINT_Y = 12
+TARGET_POINT_DISTANCE_ALONG_PATH = 13
+TARGET_POINT_VELOCITY = 14
+RIGHT_WHEEL_ANGULAR_VELOCITY = 15
+LEFT_WHEEL_ANGULAR_VELOCITY = 16
+NUM_COLUMNS = 17
+
+#
+# Simulation
+#
+@njit(cache = True)
+def append_state(
+    states: np.ndarray,
+    count: int,
+    x: float,
+    y: float,
+    heading: float,
+    velocity: float,
+    angular_velocity: float,
+    reference_x: float,
+    reference_y: float,
+    reference_distance_along_path: float,
+    cross_track_error: float,
+    checkpoint_index: int,
+    look_ahead_distance: float,
+    target_x: float,
+    target_y: float,
+    target_distance_along_path: float,
+    target_velocity: float,
+    right_wheel_angular_velocity: float,
+    left_wheel_angular_velocity: float
+) -> np.ndarray:
+    """
+    Writes the state into row `count`, doubling the buffer first when it's full, and returns the buffer
+    """
+    if count == len(states):
+        grown_states = np.empty((2 * len(states), NUM_COLUMNS))
+        grown_states[:count] = states
+        states = grown_states
+
+    states[count, POSITION_X] = x
+    states[count, POSITION_Y] = y
+    states[count, HEADING] = heading
+    states[count, VELOCITY] = velocity
+    states[count, ANGULAR_VELOCITY] = angular_velocity
+    states[count, REFERENCE_POINT_X] = reference_x
+    states[count, REFERENCE_POINT_Y] = reference_y
+    states[count, REFERENCE_POINT_DISTANCE_ALONG_PATH] = reference_distance_along_path
+    states[count, CROSS_TRACK_ERROR] = cross_track_error
+    states[count, CHECKPOINT_INDEX] = checkpoint_index
+    states[count, LOOK_AHEAD_DISTANCE] = look_ahead_distance
+    states[count, TARGET_POINT_X] = target_x
+    states[count, TARGET_POINT_Y] = target_y
+    states[count, TARGET_POINT_DISTANCE_ALONG_PATH] = target_distance_along_path
+    states[count, TARGET_POINT_VELOCITY] = target_velocity
+    states[count, RIGHT_WHEEL_ANGULAR_VELOCITY] = right_wheel_angular_velocity
+    states[count, LEFT_WHEEL_ANGULAR_VELOCITY] = left_wheel_angular_velocity
+
+    return states
+
+@njit(cache = True)
+def simulate(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    distances_along_path: np.ndarray,
+    target_velocities: np.ndarray,
+    segment_dxs: np.ndarray,
+    segment_dys: np.ndarray,
+    segment_squared_lengths: np.ndarray,
+    segment_lengths: np.ndarray,
+    max_distances_to_end: np.ndarray,
+    parameters: UpdateParameters,
+    initial_state: UpdateState,
+    wheel_radius: float,
+    track_width: float,
+    initial_x: float,
+    initial_y: float,
+    initial_heading: float,
+    initial_velocity: float,
+    initial_angular_velocity: float,
+    dt: float
+) -> np.ndarray:
+    """
+    Runs the controller, from `initial_state`, and pose propagation until the path is complete, followed by a final stopped state.
+    Returns an `(N, NUM_COLUMNS)` array with a row per step.
+    """
+    states = np.empty((1024, NUM_COLUMNS))
+    count = 0
+
+    # Pose
+    x = initial_x
+    y = initial_y
+    heading = initial_heading
+    velocity = initial_velocity
+    angular_velocity = initial_angular_velocity
+
+    # Controller state
+    (
+        checkpoint_index,
+        target_x,
+        target_y,
+        target_distance_along_path,
+        target_velocity,
+        reference_point_index,
+        reference_x,
+        reference_y,
+        reference_distance_along_path,
+        cross_track_error,
+        look_ahead_distance,
+        squared_distance_remaining,
+        is_path_complete
+    ) = initial_state
+
+    # Previous command, none before the first step
+    right_wheel_angular_velocity = 0.0
+    left_wheel_angular_velocity = 0.0
+
+    while not(is_path_complete):
+        # Propagate pose from previous command
+        if count > 0:
+            x, y, heading, velocity, angular_velocity = propagate_state(
+                x,
+                y,
+                heading,
+                right_wheel_angular_velocity,
+                left_wheel_angular_velocity,
+                wheel_radius,
+                track_width,
+                dt
+            )
+
+        # Receive a new command from the controller
+        (
+            checkpoint_index,
+            _,
+            target_x,
+            target_y,
+            target_distance_along_path,
+            target_velocity,
+            reference_point_index,
+            _,
+            reference_x,
+            reference_y,
+            reference_distance_along_path,
+            cross_track_error,
+            look_ahead_distance,
+            is_path_complete,
+            squared_distance_remaining,
+            right_wheel_angular_velocity,
+            left_wheel_angular_velocity
+        ) = update(
+            xs,
+            ys,
+            distances_along_path,
+            target_velocities,
+            segment_dxs,
+            segment_dys,
+            segment_squared_lengths,
+            segment_lengths,
+            max_distances_to_end,
+            parameters,
+            x,
+            y,
+            heading,
+            velocity,
+            angular_velocity,
+            dt,
+            checkpoint_index,
+            target_x,
+            target_y,
+            target_distance_along_path,
+            target_velocity,
+            reference_point_index,
+            reference_x,
+            reference_y,
+            reference_distance_along_path,
+            squared_distance_remaining
+        )
+
+        states = append_state(
+            states,
+            count,
+            x,
+            y,
+            heading,
+            velocity,
+            angular_velocity,
+            reference_x,
+            reference_y,
+            reference_distance_along_path,
+            cross_track_error,
+            checkpoint_index,
+            look_ahead_distance,
+            target_x,
+            target_y,
+            target_distance_along_path,
+            target_velocity,
+            right_wheel_angular_velocity,
+            left_wheel_angular_velocity
+        )
+
+        count += 1
+
+    # Stop and append final state with velocity = 0.0
+    x, y, heading, velocity, angular_velocity = propagate_state(x, y, heading, 0.0, 0.0, wheel_radius, track_width, dt)
+
+    states = append_state(
+        states,
+        count,
+        x,
+        y,
+        heading,
+        velocity,
+        angular_velocity,
+        reference_x,
+        reference_y,
+        reference_distance_along_path,
+        cross_track_error,
+        checkpoint_index,
+        look_ahead_distance,
+        target_x,
+        target_y,
+        target_distance_along_path,
+        target_velocity,
+        0.0,
+        0.0
+    )
+
+    count += 1
+
+    return states[:count].copy()
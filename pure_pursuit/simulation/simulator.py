@@ -5,14 +5,14 @@
 # Created by Christian Bator on 01/02/2025
 #
 
-from time import time_ns
-from pathlib import Path
+from time import perf_counter_ns
 
 from pure_pursuit.controller.pure_pursuit_controller import PurePursuitController
-from pure_pursuit.model.robot import Robot, RobotPose, RobotCommand
-from pure_pursuit.model.diff_drive_kinematics import propagate_pose
-from pure_pursuit.simulation.simulation_data import SimulationState, SimulationData
+from pure_pursuit.model.robot import Robot, RobotPose
+from pure_pursuit.simulation import simulation_kernels
+from pure_pursuit.simulation.simulation_data import SimulationStates, SimulationData
 from pure_pursuit.utilities.geometry import Path as GeoPath
+from pure_pursuit.utilities.jit import precompile
 
 #
 # Simulator
@@ -36,67 +36,71 @@ class Simulator:
         self._dt = dt
         self._path = path
 
+    #
+    # Properties
+    #
+    @property
+    def robot(self) -> Robot:
+        return self._robot
+
+    @property
+    def controller(self) -> PurePursuitController:
+        return self._controller
+
+    @property
+    def dt(self) -> float:
+        return self._dt
+
     #
     # Simulation
     #
     def simulate(self) -> SimulationData:
-        previous_pose = self._initial_pose
-        previous_command = None
-
-        states: list[SimulationState] = []
-        step_calculation_times_ns: list[float] = []
-
-        while not(self._controller.is_path_complete):
-            # Start timing step calculation
-            step_start_time_ns = time_ns()
-
-            # Propagate pose from previous command
-            pose = propagate_pose(robot = self._robot, previous_pose = previous_pose, previous_command = previous_command, dt = self._dt)
-
-            # Receive a new command from the controller
-            command = self._controller.update(pose = pose, dt = self._dt)
-
-            # Stop timing step calculation
-            step_calculation_times_ns.append(time_ns() - step_start_time_ns)
-
-            states.append(
-                SimulationState(
-                    pose = pose,
-                    reference_point = self._controller.current_reference_point,
-                    cross_track_error = self._controller.current_cross_track_error,
-                    checkpoint_index = self._controller.current_checkpoint_index,
-                    look_ahead_distance = self._controller.current_look_ahead_distance,
-                    target_point = self._controller.current_target_point,
-                    command = command
-                )
-            )
-
-            previous_pose = pose
-            previous_command = command
-
-        # Stop and append final state with velocity = 0.0
-        previous_command = RobotCommand(right_wheel_angular_velocity = 0.0, left_wheel_angular_velocity = 0.0)
-        final_pose = propagate_pose(robot = self._robot, previous_pose = previous_pose, previous_command = previous_command, dt = self._dt)
-
-        states.append(
-            SimulationState(
-                pose = final_pose,
-                reference_point = self._controller.current_reference_point,
-                cross_track_error = self._controller.current_cross_track_error,
-                checkpoint_index = self._controller.current_checkpoint_index,
-                look_ahead_distance = self._controller.current_look_ahead_distance,
-                target_point = self._controller.current_target_point,
-                command = previous_command
-            )
+        path = self._controller.path
+        initial_pose = self._initial_pose
+
+        arguments = (
+            path.xs,
+            path.ys,
+            path.distances_along_path,
+            path.target_velocities,
+            path.segment_dxs,
+            path.segment_dys,
+            path.segment_squared_lengths,
+            path.segment_lengths,
+            path.max_distances_to_end,
+            self._controller.kernel_parameters,
+            self._controller.kernel_state,
+            self._robot.wheel_radius,
+            self._robot.track_width,
+            initial_pose.position.x,
+            initial_pose.position.y,
+            initial_pose.heading,
+            initial_pose.velocity,
+            initial_pose.angular_velocity,
+            self._dt
         )
 
+        # Compile (or load) the kernel first, so one-time JIT work isn't counted as step time
+        precompile(simulation_kernels.simulate, *arguments)
+
+        # Run every step in one compiled call, timing the whole run since steps aren't timed individually
+        start_time_ns = perf_counter_ns()
+
+        state_rows = simulation_kernels.simulate(*arguments)
+
+        calculation_time_ns = perf_counter_ns() - start_time_ns
+
+        # Every row but the final stopped state is a controller step
+        num_steps = len(state_rows) - 1
+
         simulation_data = SimulationData(
             robot = self._robot,
             controller = self._controller,
             dt = self._dt,
             path = self._path,
-            states = states,
-            step_calculation_times_ns = step_calculation_times_ns
+            states = SimulationStates(state_rows),
+            num_steps = num_steps,
+            calculation_time_ns = calculation_time_ns
         )
 
         return simulation_data
@@ -0,0 +1,117 @@
+#
+# file_cache.py
+# pure-pursuit
+#
+# Created by Christian Bator on 10/14/2026
+#
+
+import os
+import json
+import pickle
+from typing import BinaryIO, Callable, Optional, TypeVar
+from dataclasses import fields, MISSING
+from hashlib import blake2b
+from pathlib import Path
+from zipfile import BadZipFile
+
+from pure_pursuit.utilities.json_codable import JSONDecodable
+
+import numpy as np
+
+# Bump when the layout of cached objects changes, so older cache entries are ignored
+CACHE_VERSION = 1
+
+T = TypeVar("T")
+D = TypeVar("D", bound = JSONDecodable)
+
+#
+# Digests
+#
+def digest(data: bytes) -> str:
+    return blake2b(data, digest_size = 16).hexdigest()
+
+def file_digest(filepath: Path) -> str:
+    return digest(filepath.read_bytes())
+
+def schema_digest(dataclass_type: type) -> str:
+    """
+    Digest of a dataclass' field names, types and defaults, which change whenever its pickled layout or decoding does
+    """
+    schema = [
+        (field.name, str(field.type), None if field.default is MISSING else repr(field.default))
+        for field in fields(dataclass_type)
+    ]
+
+    return digest(repr(schema).encode())
+
+#
+# File Cache
+#
+def write_atomically(filepath: Path, write: Callable[[BinaryIO], None]):
+    # Write to a temporary file first, so a concurrent run never reads a partial entry
+    filepath.parent.mkdir(parents = True, exist_ok = True)
+    temporary_filepath = filepath.with_suffix(f".{os.getpid()}.tmp")
+
+    with open(temporary_filepath, "wb") as temporary_file:
+        write(temporary_file)
+
+    os.replace(temporary_filepath, filepath)
+
+def load_cached(cache_dir: Optional[Path], key: str, create: Callable[[], T]) -> T:
+    """
+    Returns the object pickled under `key` in `cache_dir`, or creates it with `create` and pickles it for next time.
+    Unreadable cache entries are recreated, and a `cache_dir` of None disables caching.
+    `key` must change whenever the object's class layout does, since unpickling doesn't check it.
+    Only use a `cache_dir` you trust, since its entries are unpickled.
+    """
+    if cache_dir is None:
+        return create()
+
+    cache_filepath = cache_dir / f"{key}-v{CACHE_VERSION}.pkl"
+
+    try:
+        with open(cache_filepath, "rb") as cache_file:
+            value: T = pickle.load(cache_file)
+            return value
+    except (OSError, EOFError, AttributeError, ImportError, pickle.UnpicklingError):
+        pass
+
+    value = create()
+
+    write_atomically(cache_filepath, lambda file: pickle.dump(value, file, protocol = pickle.HIGHEST_PROTOCOL))
+
+    return value
+
+def load_cached_arrays(cache_dir: Optional[Path], key: str, create: Callable[[], dict[str, np.ndarray]]) -> dict[str, np.ndarray]:
+    """
+    Like `load_cached`, but for named arrays, which are stored as an uncompressed `.npz` and loaded without unpickling
+    """
+    if cache_dir is None:
+        return create()
+
+    cache_filepath = cache_dir / f"{key}-v{CACHE_VERSION}.npz"
+
+    try:
+        with np.load(cache_filepath, allow_pickle = False) as cache_file:
+            return {name: cache_file[name] for name in cache_file.files}
+    except (OSError, EOFError, ValueError, BadZipFile):
+        pass
+
+    arrays = create()
+
+    write_atomically(cache_filepath, lambda file: np.savez(file, allow_pickle = False, **arrays))
+
+    return arrays
+
+def load_cached_json(cache_dir: Optional[Path], filepath: Path, dataclass_type: type[D]) -> D:
+    """
+    Returns the `dataclass_type` decoded from the JSON in `filepath`, cached by the file's contents and the dataclass' fields
+    """
+    def create() -> D:
+        with open(filepath) as file:
+            return dataclass_type.decode(json.load(file))
+
+    if cache_dir is None:
+        return create()
+
+    return load_cached(cache_dir = cache_dir, key = f"{dataclass_type.__qualname__}-{schema_digest(dataclass_type)}-{file_digest(filepath)}", create = create)
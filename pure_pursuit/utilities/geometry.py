@@ -5,10 +5,14 @@
 # Created by Christian Bator on 01/02/2025
 #
 
-from typing import Any, Protocol, Iterator, Sequence, Optional
-from math import degrees, dist, pi, atan2, fabs, sqrt, cos, sin
+from typing import Any, Protocol, Iterator, Sequence, Optional, Self
+from dataclasses import dataclass
+from math import degrees, pi, tau, atan2, fabs, sqrt, hypot, remainder, cos, sin
 
-from pure_pursuit.utilities.math_extensions import is_float_equal, is_float_within, sgn
+from pure_pursuit.utilities.math_extensions import is_float_equal, is_float_within
+
+import numpy as np
+from numpy.typing import ArrayLike
 
 #
 # Point
@@ -23,19 +27,10 @@ class PointProtocol(Protocol):
     def y(self) -> float:
         ...
 
+@dataclass(slots = True)
 class Point:
-
-    def __init__(self, x: float, y: float):
-        self._x = x
-        self._y = y
-
-    @property
-    def x(self) -> float:
-        return self._x
-
-    @property
-    def y(self) -> float:
-        return self._y
+    x: float
+    y: float
 
     def __str__(self) -> str:
         return f"({self.x:0,.3f}, {self.y:0,.3f})"
@@ -49,27 +44,18 @@ class Point:
 #
 # ReferencePoint
 #
+@dataclass(slots = True)
 class ReferencePoint:
-
-    def __init__(self, position: Point, distance_along_path: float):
-        self._position = position
-        self._distance_along_path = distance_along_path
-
-    @property 
-    def position(self) -> Point:
-        return self._position
+    position: Point
+    distance_along_path: float
 
     @property
     def x(self) -> float:
-        return self._position.x
+        return self.position.x
 
     @property
     def y(self) -> float:
-        return self._position.y
-
-    @property
-    def distance_along_path(self) -> float:
-        return self._distance_along_path
+        return self.position.y
 
     def __str__(self) -> str:
         return f"(x: {self.x:0,.3f}, y: {self.y:0,.3f}, d: {self.distance_along_path:0,.3f})"
@@ -77,32 +63,9 @@ class ReferencePoint:
 #
 # TargetPoint
 #
+@dataclass(slots = True)
 class TargetPoint(ReferencePoint):
-
-    def __init__(self, position: Point, distance_along_path: float, target_velocity: float):
-        self._position = position
-        self._distance_along_path = distance_along_path
-        self._target_velocity = target_velocity
-
-    @property 
-    def position(self) -> Point:
-        return self._position
-
-    @property
-    def x(self) -> float:
-        return self._position.x
-
-    @property
-    def y(self) -> float:
-        return self._position.y
-
-    @property
-    def distance_along_path(self)-> float:
-        return self._distance_along_path
-
-    @property
-    def target_velocity(self) -> float:
-        return self._target_velocity
+    target_velocity: float
 
     def __str__(self) -> str:
         return f"(x: {self.x:0,.3f}, y: {self.y:0,.3f}, d: {self.distance_along_path:0,.3f}, v: {self.target_velocity:0,.2f})"
@@ -110,78 +73,145 @@ class TargetPoint(ReferencePoint):
 #
 # Waypoint
 #
+@dataclass(slots = True)
 class Waypoint(TargetPoint):
+    angle: float
 
-    def __init__(self, position: Point, angle: float, distance_along_path: float, target_velocity: float):
-        self._position = position
-        self._angle = angle
-        self._distance_along_path = distance_along_path
-        self._target_velocity = target_velocity
+    def __str__(self) -> str:
+        return f"(x: {self.x:0,.3f}, y: {self.y:0,.3f}, a: {degrees(self.angle):0,.1f}, d: {self.distance_along_path:0,.3f}, v: {self.target_velocity:0,.3f})"
 
-    @property 
-    def position(self) -> Point:
-        return self._position
+#
+# Path
+#
+class Path:
+    """
+    Waypoint fields stored as parallel float64 arrays, with `Waypoint` objects only created when accessed
+    """
+
+    def __init__(
+        self,
+        xs: ArrayLike,
+        ys: ArrayLike,
+        angles: ArrayLike,
+        distances_along_path: ArrayLike,
+        target_velocities: ArrayLike
+    ):
+        self._xs = _read_only_column(xs)
+        self._ys = _read_only_column(ys)
+        self._angles = _read_only_column(angles)
+        self._distances_along_path = _read_only_column(distances_along_path)
+        self._target_velocities = _read_only_column(target_velocities)
+
+        # Per-segment invariants, where segment `i` runs from waypoint `i` to `i + 1`
+        self._segment_dxs = _read_only_column(np.diff(self._xs))
+        self._segment_dys = _read_only_column(np.diff(self._ys))
+        self._segment_squared_lengths = _read_only_column(self._segment_dxs * self._segment_dxs + self._segment_dys * self._segment_dys)
+        self._segment_lengths = _read_only_column(np.diff(self._distances_along_path))
+
+        # Farthest distance from the end point of any waypoint at or after each index
+        distances_to_end = np.hypot(self._xs - self._xs[-1], self._ys - self._ys[-1])
+        self._max_distances_to_end = _read_only_column(np.maximum.accumulate(distances_to_end[::-1])[::-1])
+
+        self._average_absolute_angle = float(np.abs(self._angles).mean())
+
+        self._start_point = self[0]
+        self._end_point = self[-1]
+
+    @classmethod
+    def from_waypoints(cls, waypoints: Sequence[Waypoint]) -> Self:
+        return cls(
+            xs = [waypoint.x for waypoint in waypoints],
+            ys = [waypoint.y for waypoint in waypoints],
+            angles = [waypoint.angle for waypoint in waypoints],
+            distances_along_path = [waypoint.distance_along_path for waypoint in waypoints],
+            target_velocities = [waypoint.target_velocity for waypoint in waypoints]
+        )
 
     @property
-    def x(self) -> float:
-        return self._position.x
+    def xs(self) -> np.ndarray:
+        return self._xs
 
     @property
-    def y(self) -> float:
-        return self._position.y
+    def ys(self) -> np.ndarray:
+        return self._ys
 
     @property
-    def angle(self) -> float:
-        return self._angle
+    def angles(self) -> np.ndarray:
+        return self._angles
 
     @property
-    def distance_along_path(self) -> float:
-        return self._distance_along_path
+    def distances_along_path(self) -> np.ndarray:
+        return self._distances_along_path
 
     @property
-    def target_velocity(self) -> float:
-        return self._target_velocity
+    def target_velocities(self) -> np.ndarray:
+        return self._target_velocities
 
-    def __str__(self) -> str:
-        return f"(x: {self.x:0,.3f}, y: {self.y:0,.3f}, a: {degrees(self.angle):0,.1f}, d: {self.distance_along_path:0,.3f}, v: {self.target_velocity:0,.3f})"
+    @property
+    def segment_dxs(self) -> np.ndarray:
+        return self._segment_dxs
 
-#
-# Path
-#
-class Path:
+    @property
+    def segment_dys(self) -> np.ndarray:
+        return self._segment_dys
 
-    def __init__(self, waypoints: list[Waypoint]):
-        self._waypoints = waypoints
+    @property
+    def segment_squared_lengths(self) -> np.ndarray:
+        return self._segment_squared_lengths
+
+    @property
+    def segment_lengths(self) -> np.ndarray:
+        return self._segment_lengths
+
+    @property
+    def max_distances_to_end(self) -> np.ndarray:
+        return self._max_distances_to_end
 
     @property
     def waypoints(self) -> list[Waypoint]:
-        return self._waypoints
+        return list(self)
     
     @property
     def start_point(self) -> Waypoint:
-        return self.waypoints[0]
+        return self._start_point
 
     @property
     def end_point(self) -> Waypoint:
-        return self.waypoints[-1]
+        return self._end_point
 
     @property
     def total_distance(self) -> float:
-        return self.end_point.distance_along_path
+        return self._end_point.distance_along_path
+
+    @property
+    def average_absolute_angle(self) -> float:
+        return self._average_absolute_angle
 
     def __len__(self) -> int:
-        return len(self.waypoints)
+        return len(self._xs)
 
-    def __getitem__(self, index) -> Waypoint:
-        return self.waypoints[index]
+    def __getitem__(self, index: int) -> Waypoint:
+        return Waypoint(
+            position = Point(x = float(self._xs[index]), y = float(self._ys[index])),
+            distance_along_path = float(self._distances_along_path[index]),
+            target_velocity = float(self._target_velocities[index]),
+            angle = float(self._angles[index])
+        )
 
     def __iter__(self) -> Iterator[Waypoint]:
-        return iter(self.waypoints)
+        for x, y, angle, distance_along_path, target_velocity in zip(
+            self._xs.tolist(),
+            self._ys.tolist(),
+            self._angles.tolist(),
+            self._distances_along_path.tolist(),
+            self._target_velocities.tolist()
+        ):
+            yield Waypoint(position = Point(x = x, y = y), distance_along_path = distance_along_path, target_velocity = target_velocity, angle = angle)
 
     def __str__(self) -> str:
         result = "[\n"
 
-        for waypoint in self.waypoints:
+        for waypoint in self:
             result += "  "
             result += waypoint.__str__()
             result += ",\n"
@@ -190,11 +220,17 @@ class Path:
 
         return result
 
+def _read_only_column(values: ArrayLike) -> np.ndarray:
+    column = np.array(values, dtype = np.float64)
+    column.flags.writeable = False
+
+    return column
+
 #
 # Utility Methods
 #
 def distance_between(point_1: PointProtocol, point_2: PointProtocol) -> float:
-    return dist([point_1.x, point_1.y], [point_2.x, point_2.y])
+    return hypot(point_2.x - point_1.x, point_2.y - point_1.y)
 
 def bounding_box(points: Sequence[PointProtocol]) -> tuple[float, float, float, float]:
     xs = [point.x for point in points]
@@ -215,12 +251,11 @@ def subtract_angles(angle_1: float, angle_2: float) -> float:
     return normalize_angle(angle_2 - angle_1)
 
 def normalize_angle(angle: float) -> float:
-    result = angle
+    # Exact remainder into [-pi, pi], with -pi moved to pi so the range is (-pi, pi]
+    result = remainder(angle, tau)
 
-    if result > pi:
-        result -= 2.0 * pi
-    elif result <= -pi:
-        result += 2.0 * pi
+    if result == -pi:
+        result = pi
 
     return result
 
@@ -228,11 +263,14 @@ def line_segment_angle(segment: list[PointProtocol]) -> float:
     a = segment[0]
     b = segment[1]
 
-    return atan2(b.y - a.y, b.x - a.x)
+    return line_segment_angle_xy(a.x, a.y, b.x, b.y)
+
+def line_segment_angle_xy(ax: float, ay: float, bx: float, by: float) -> float:
+    return atan2(by - ay, bx - ax)
 
 def angle_between_segments(segment_1: list[PointProtocol], segment_2: list[PointProtocol]) -> float:
-    segment_1_angle = line_segment_angle([segment_1[0], segment_1[1]])
-    segment_2_angle = line_segment_angle([segment_2[0], segment_2[1]])
+    segment_1_angle = line_segment_angle_xy(segment_1[0].x, segment_1[0].y, segment_1[1].x, segment_1[1].y)
+    segment_2_angle = line_segment_angle_xy(segment_2[0].x, segment_2[0].y, segment_2[1].x, segment_2[1].y)
 
     return subtract_angles(segment_1_angle, segment_2_angle)
  
@@ -249,7 +287,8 @@ def point_line_orientation(point: PointProtocol, line: Sequence[PointProtocol])
 
     cross_product = (point.x - a.x) * (b.y - a.y) - (point.y - a.y) * (b.x - a.x)
 
-    return sgn(cross_product)
+    # Inlined `sgn`, so collinear points (within 1e-9) are on the right
+    return 1 if cross_product >= -1e-9 else -1
 
 def point_vector_distance(point: PointProtocol, vector_start: PointProtocol, vector_angle: float) -> float:
     return point_line_distance(point, [vector_start, add_point_on_vector(vector_start, vector_angle)])
@@ -0,0 +1,46 @@
+#
+# jit.py
+# pure-pursuit
+#
+# Created by Christian Bator on 10/14/2026
+#
+
+from typing import Any, Callable, Optional, TypeVar
+from types import ModuleType
+from importlib import import_module
+
+#
+# Numba
+#
+try:
+    numba: Optional[ModuleType] = import_module("numba")
+except ImportError:
+    numba = None
+
+F = TypeVar("F", bound = Callable[..., Any])
+
+def njit(**options: Any) -> Callable[[F], F]:
+    """
+    Compiles the decorated function with numba if it's installed (`pip install .[jit]`),
+    otherwise the function is returned unchanged and runs as plain python
+    """
+    def decorator(function: F) -> F:
+        if numba is None:
+            return function
+
+        return numba.njit(**options)(function)
+
+    return decorator
+
+def precompile(function: Callable[..., Any], *arguments: Any):
+    """
+    Compiles the numba function for the types of `arguments` (or loads it from numba's cache) without calling it,
+    so one-time compilation and initialization can be kept out of timings. Does nothing without numba.
+    """
+    # Functions stay plain python without numba, or when it's disabled with `NUMBA_DISABLE_JIT`
+    compile_function = getattr(function, "compile", None)
+
+    if numba is None or compile_function is None:
+        return
+
+    compile_function(tuple(numba.typeof(argument) for argument in arguments))
@@ -17,6 +17,8 @@ JSON = dict[str, Any]
 #
 class JSONDecodable(Protocol):
 
+    __slots__ = ()
+
     @classmethod
     def decode(cls, json_data: JSON) -> Self:
         ...
@@ -0,0 +1,55 @@
+#
+# json_io.py
+# pure-pursuit
+#
+# Created by Christian Bator on 10/14/2026
+#
+
+import json
+from typing import Any, Optional
+from types import ModuleType
+from importlib import import_module
+from pathlib import Path
+
+#
+# orjson
+#
+try:
+    orjson: Optional[ModuleType] = import_module("orjson")
+except ImportError:
+    orjson = None
+
+#
+# JSON
+#
+def parse_json(data: bytes) -> Any:
+    """
+    Parses JSON with orjson if it's installed (`pip install .[json]`), otherwise with the standard library
+    """
+    if orjson is None:
+        return json.loads(data)
+
+    return orjson.loads(data)
+
+def format_json(value: Any) -> str:
+    """
+    Formats JSON with sorted keys and indentation. The standard library keeps the repo's 4 space indentation,
+    while orjson only supports 2 spaces and writes the exponents of very small floats unpadded (`1e-6` instead of `1e-06`),
+    so the output parses to the same values with either, but its whitespace depends on whether orjson is installed
+    """
+    if orjson is None:
+        return json.dumps(value, indent = 4, sort_keys = True)
+
+    formatted_json: str = orjson.dumps(value, option = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
+
+    return formatted_json
+
+def write_json(filepath: Path, value: Any):
+    """
+    Writes `value` to `filepath` formatted like `format_json`, in a single write
+    """
+    if orjson is None:
+        filepath.write_text(format_json(value))
+        return
+
+    filepath.write_bytes(orjson.dumps(value, option = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
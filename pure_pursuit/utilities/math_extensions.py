@@ -7,6 +7,10 @@
 
 from typing import Sized
 from math import isclose
+from statistics import fmean
+from itertools import pairwise
+
+import numpy as np
 
 #
 # Types
@@ -22,44 +26,23 @@ def is_float_equal(value: float, test_value: float) -> bool:
 	return isclose(value, test_value, abs_tol = 1e-9)
 
 def is_float_less_or_equal(value: float, test_value: float) -> bool:
-	if value < test_value:
-		return True
-	elif is_float_equal(value, test_value):
-		return True
-	else:
-		return False
+	return value < test_value or is_float_equal(value, test_value)
 
 def is_float_greater_or_equal(value: float, test_value: float) -> bool:
-	if value > test_value:
-		return True
-	elif is_float_equal(value, test_value):
-		return True
-	else:
-		return False
+	return value > test_value or is_float_equal(value, test_value)
 
 def is_float_within(value: float, min_value: float, max_value: float) -> bool:
-	if min_value < value < max_value:
-		return True
-	elif is_float_equal(value, min_value):
-		return True
-	elif is_float_equal(value, max_value):
-		return True
-	else:
-		return False
+	return (min_value < value < max_value) or is_float_equal(value, min_value) or is_float_equal(value, max_value)
 
 #
 # Utility Methods
 #
 def sgn(number: Number) -> int:
-	if number > 0.0:
-		return 1
-	elif is_float_equal(number, 0.0):
-		return 1
-	else:
-		return -1
+	# Zero (within 1e-9, as `is_float_equal(number, 0.0)`) counts as positive
+	return 1 if number >= -1e-9 else -1
 
 def average(list_input: list[Number]) -> float:
-	return float(sum(list_input)) / float(len(list_input))
+	return fmean(list_input)
 
 def end_index(list_input: Sized) -> int:
 	return len(list_input) - 1
@@ -75,14 +58,26 @@ def constrain(value: Number, min_value: Number, max_value: Number) -> Number:
 	else:
 		return value
 
-def is_increasing(list_input: list[Number]) -> bool:
-    return all(x <= y for x, y in zip(list_input, list_input[1:]))
+def is_increasing(list_input: list[Number] | np.ndarray) -> bool:
+    if isinstance(list_input, np.ndarray):
+        return bool(np.all(np.diff(list_input) >= 0))
+
+    return all(x <= y for x, y in pairwise(list_input))
+
+def is_decreasing(list_input: list[Number] | np.ndarray) -> bool:
+    if isinstance(list_input, np.ndarray):
+        return bool(np.all(np.diff(list_input) <= 0))
+
+    return all(x >= y for x, y in pairwise(list_input))
+
+def is_strictly_increasing(list_input: list[Number] | np.ndarray) -> bool:
+    if isinstance(list_input, np.ndarray):
+        return bool(np.all(np.diff(list_input) > 0))
 
-def is_decreasing(list_input: list[Number]) -> bool:
-    return all(x >= y for x, y in zip(list_input, list_input[1:]))
+    return all(x < y for x, y in pairwise(list_input))
 
-def is_strictly_increasing(list_input: list[Number]) -> bool:
-    return all(x < y for x, y in zip(list_input, list_input[1:]))
+def is_strictly_decreasing(list_input: list[Number] | np.ndarray) -> bool:
+    if isinstance(list_input, np.ndarray):
+        return bool(np.all(np.diff(list_input) < 0))
 
-def is_strictly_decreasing(list_input: list[Number]) -> bool:
-    return all(x > y for x, y in zip(list_input, list_input[1:]))
+    return all(x > y for x, y in pairwise(list_input))
@@ -5,11 +5,13 @@
 # Created by Christian Bator on 01/02/2025
 #
 
-import json
 import argparse
 from pathlib import Path
+from math import ceil
 
-from pure_pursuit.utilities.geometry import Point
+from pure_pursuit.utilities.json_io import write_json
+
+import numpy as np
 
 #
 # Constants
@@ -23,29 +25,15 @@ WAYPOINT_DISTANCE = 2.0
 def main(max_x: int, max_y: int, output_dir: Path):
 	print(f"> Generating coverage path ({max_x} x {max_y} m\u00b2) ...")
 
-	x = 0.0
-	y = 0.0
-
-	points = [Point(x, y)]
-	is_direction_up = True
-
-	while True:
-		if is_direction_up:
-			while y < max_y:
-				y += WAYPOINT_DISTANCE
-				points.append(Point(x, y))
-		else:
-			while y > 0:
-				y -= WAYPOINT_DISTANCE
-				points.append(Point(x, y))
+	# Stripes of waypoints from y = 0 to the first waypoint at or past max_y, alternating up and down
+	num_waypoint_steps = max(ceil(max_y / WAYPOINT_DISTANCE), 0)
+	num_stripes = max(ceil(max_x / STRIPE_WIDTH), 1)
 
-		x += STRIPE_WIDTH
+	stripe_ys = np.arange(num_waypoint_steps + 1) * WAYPOINT_DISTANCE
+	is_stripe_up = np.arange(num_stripes) % 2 == 0
 
-		if x < max_x:
-			points.append(Point(x, y))
-			is_direction_up = not is_direction_up
-		else:
-			break
+	xs = np.repeat(np.arange(num_stripes) * STRIPE_WIDTH, num_waypoint_steps + 1)
+	ys = np.where(is_stripe_up[:, np.newaxis], stripe_ys, stripe_ys[::-1]).ravel()
 
 	path_name = f"coverage-path-{max_x}x{max_y}"
 	filepath = output_dir / f"{path_name}.json"
@@ -53,9 +41,8 @@ def main(max_x: int, max_y: int, output_dir: Path):
 
 	output_dir.mkdir(parents = True, exist_ok = True)
 
-	with open(filepath, "w") as file:
-		points_json = [point.to_json() for point in points]
-		file.write(json.dumps(points_json, indent = 4, sort_keys = True))
+	points_json = [{"x": x, "y": y} for x, y in zip(xs.tolist(), ys.tolist())]
+	write_json(filepath, points_json)
 
 	print("> Done")
 
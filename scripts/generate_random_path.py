@@ -5,14 +5,13 @@
 # Created by Christian Bator on 01/02/2025
 #
 
-from typing import Optional
-import json
 import argparse
 from pathlib import Path
-from random import seed, random
-from math import radians, pi, cos, sin
+from math import radians, pi
 
-from pure_pursuit.utilities.geometry import Point, line_segment_angle
+from pure_pursuit.utilities.json_io import write_json
+
+import numpy as np
 
 #
 # Constants
@@ -26,57 +25,55 @@ MAX_ANGLE_DELTA = radians(108.0)
 #
 # Utility Methods
 #
-def random_in_range(min_value: float, max_value: float) -> float:
-	return min_value + (random() * (max_value - min_value))
+def generate_paths(rng: np.random.RandomState, num_paths: int, num_points: int, min_distance: float, max_distance: float, max_angle_delta: float) -> tuple[np.ndarray, np.ndarray]:
+	"""
+	Returns the (xs, ys) of `num_paths` random walks from the origin, as `(num_paths, num_points)` arrays,
+	where the first step has a random heading and every later step turns by up to `max_angle_delta` from the previous one
+	"""
+	num_steps = num_points - 1
+
+	# Alternate heading and distance draws, path by path, so the random stream is consumed in the same order as generating a step at a time
+	uniform_draws = rng.random_sample((num_paths, num_steps, 2))
 
-def generate_point_after(point_1: Optional[Point], point_2: Point, min_distance: float, max_distance: float, max_angle_delta: float) -> Point:
-	if point_1 is None:
-		theta = random_in_range(0.0, 2.0 * pi)
-	else:
-		previous_theta = line_segment_angle([point_1, point_2])
-		delta_theta = random_in_range(-max_angle_delta, max_angle_delta)
-		theta = previous_theta + delta_theta
+	heading_changes = -max_angle_delta + uniform_draws[:, :, 0] * (2.0 * max_angle_delta)
+	heading_changes[:, 0] = uniform_draws[:, 0, 0] * (2.0 * pi)
+	thetas = np.cumsum(heading_changes, axis = 1)
 
-	radius = random_in_range(min_distance, max_distance)
+	radii = min_distance + uniform_draws[:, :, 1] * (max_distance - min_distance)
 
-	x = point_2.x + radius * cos(theta)
-	y = point_2.y + radius * sin(theta)
+	# Sum the steps as complex numbers, so each heading's cos and sin come from one exp call
+	positions = np.zeros((num_paths, num_points), dtype = np.complex128)
+	np.cumsum(radii * np.exp(1j * thetas), axis = 1, out = positions[:, 1:])
 
-	return Point(x, y)
+	return (positions.real, positions.imag)
 
 #
 # Main
 #
 def main(num_paths: int, output_dir: Path):
-	seed(RANDOM_SEED)
+	# Seeding MT19937 with [RANDOM_SEED] matches Python's random.seed(RANDOM_SEED), so the paths match ones generated with the random module
+	rng = np.random.RandomState([RANDOM_SEED])
 
 	path_text = "path" if num_paths == 1 else "paths"
 	print(f"> Generating {num_paths} {path_text} ...")
 	print(f"> Saving to '{output_dir}'...")
 
-	for path_num in range(0, num_paths):
+	path_xs, path_ys = generate_paths(
+		rng = rng,
+		num_paths = num_paths,
+		num_points = NUM_POINTS,
+		min_distance = MIN_DISTANCE,
+		max_distance = MAX_DISTANCE,
+		max_angle_delta = MAX_ANGLE_DELTA
+	)
+
+	# Convert to Python floats a path at a time, so only one path's boxed coordinates exist at once
+	for path_num, (xs, ys) in enumerate(zip(path_xs, path_ys)):
 		path_name = f"random-path-{path_num + 1}"
-		points = [Point(0.0, 0.0)]
-
-		for index in range(1, NUM_POINTS):
-			point_1 = None if (index - 2) < 0 else points[index - 2]
-			point_2 = points[index - 1]
-
-			point = generate_point_after(
-				point_1,
-				point_2,
-				min_distance = MIN_DISTANCE,
-				max_distance = MAX_DISTANCE,
-				max_angle_delta = MAX_ANGLE_DELTA
-			)	
-
-			points.append(point)
-			
 		filepath = output_dir / f"{path_name}.json"
 
-		with open(filepath, "w") as file:
-			points_json = [point.to_json() for point in points]
-			file.write(json.dumps(points_json, indent = 4, sort_keys = True))
+		points_json = [{"x": x, "y": y} for x, y in zip(xs.tolist(), ys.tolist())]
+		write_json(filepath, points_json)
 		
 	print("> Done")
 
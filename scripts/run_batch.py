@@ -0,0 +1,67 @@
+#
+# run_batch.py
+# pure-pursuit
+#
+# Created by Christian Bator on 10/14/2026
+#
+
+from typing import Optional
+import argparse
+from pathlib import Path
+
+from pure_pursuit.pure_pursuit import RESULT_DIR, CACHE_DIR
+from pure_pursuit.simulation.simulation_job import SimulationJob, run_simulations, save_cross_track_errors
+from pure_pursuit.utilities.print_colors import cyan
+
+#
+# Main
+#
+def main(
+	paths_dir: Path,
+	simulation_config_filepath: Path,
+	robot_config_filepath: Path,
+	pure_pursuit_config_filepath: Path,
+	num_workers: Optional[int],
+	use_cache: bool
+):
+	jobs = [
+		SimulationJob(
+			path_filepath = path_filepath,
+			simulation_config_filepath = simulation_config_filepath,
+			robot_config_filepath = robot_config_filepath,
+			pure_pursuit_config_filepath = pure_pursuit_config_filepath
+		)
+		for path_filepath in sorted(paths_dir.glob("*.json"))
+	]
+
+	print(f"> Simulating {len(jobs)} paths ...")
+
+	summaries = run_simulations(jobs = jobs, max_workers = num_workers, cache_dir = CACHE_DIR if use_cache else None)
+
+	for summary in summaries:
+		print(f"> {cyan(summary.path_name)}")
+		print(summary.result_text)
+
+		save_cross_track_errors(filepath = RESULT_DIR / f"{summary.path_name}.npy", cross_track_errors = summary.cross_track_errors)
+
+	print(f"> Saved output to {RESULT_DIR}")
+	print("> Done")
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser()
+	parser.add_argument("-d", "--paths_dir", required = True)
+	parser.add_argument("-s", "--simulation_config_filepath", required = True)
+	parser.add_argument("-r", "--robot_config_filepath", required = True)
+	parser.add_argument("-c", "--pure_pursuit_config_filepath", required = True)
+	parser.add_argument("-w", "--num_workers", type = int, default = None)
+	parser.add_argument("--no_cache", action = "store_true")
+	args = parser.parse_args()
+
+	main(
+		paths_dir = Path(args.paths_dir),
+		simulation_config_filepath = Path(args.simulation_config_filepath),
+		robot_config_filepath = Path(args.robot_config_filepath),
+		pure_pursuit_config_filepath = Path(args.pure_pursuit_config_filepath),
+		num_workers = args.num_workers,
+		use_cache = not args.no_cache
+	)